@@ -3,6 +3,39 @@ from __future__ import annotations
 import argparse
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional
+    orjson = None  # type: ignore
+
+# One keep-alive session for every call so repeated requests reuse the socket.
+# Transient gateway errors and refused connections (server warming up) are
+# retried with backoff; reads are not retried since the server may be mid-job.
+_RETRY = Retry(
+    total=3,
+    connect=3,
+    read=0,
+    backoff_factor=0.5,
+    status_forcelist=[502, 503, 504],
+    allowed_methods=["GET", "PUT", "POST"],
+)
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=_RETRY))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=_RETRY))
+
+# (connect, read) seconds: fail fast on an unreachable host, wait out slow models
+_TIMEOUT = (5, 60)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _body(payload: dict) -> bytes:
+    # Serialize once ourselves rather than letting requests re-encode via stdlib json
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
 
 
 def main() -> None:
@@ -18,13 +51,13 @@ def main() -> None:
 
     # Ask
     q = {"scope": args.scope, "date": args.date, "query": "otp and top risks"}
-    r = requests.post(f"{base}/ai/ask", json=q, timeout=5)
+    r = _SESSION.post(f"{base}/ai/ask", data=_body(q), headers=_JSON_HEADERS, timeout=_TIMEOUT)
     print("ASK:", r.status_code)
     print(json.dumps(r.json(), indent=2))
 
     # Suggest
     s = {"scope": args.scope, "date": args.date, "train_id": (args.train or None), "max_hold_min": 3}
-    r2 = requests.post(f"{base}/ai/suggest", json=s, timeout=8)
+    r2 = _SESSION.post(f"{base}/ai/suggest", data=_body(s), headers=_JSON_HEADERS, timeout=_TIMEOUT)
     print("SUGGEST:", r2.status_code)
     print(json.dumps(r2.json(), indent=2))
 
@@ -1,17 +1,39 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 import hashlib
 import json
+import os
+import threading
+import time
+import uuid
 from datetime import datetime, timezone
+from functools import lru_cache
 
 import pandas as pd
 from fastapi import Depends, FastAPI, HTTPException, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
+from src.data.cache import read_parquet_cached, read_parquet_head
+from src.data.serdes import dumps_json, expand_refs, loads_json
+from src.feedback.logger import action_fields, append_audit_entry, append_feedback_row, audit_paths, load_audit_trail
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional
+    orjson = None  # type: ignore
+
+
+def _digest(data: bytes) -> str:
+    # One algorithm everywhere so ids match across deployments
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
 app = FastAPI(title="Train Control Decision Support API")
 
 # CORS for local frontend development (React/Vite on localhost)
@@ -40,23 +62,138 @@ def _art_dir(scope: str, date: str) -> Path:
 def _read_json(path: Path) -> Any:
     if not path.exists():
         return None
+    if orjson is not None:
+        raw = path.read_bytes()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # Older artifacts may contain NaN/Infinity, which only stdlib json accepts
+            return json.loads(raw)
     return json.loads(path.read_text())
 
 
 def _write_json(path: Path, payload: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2))
+    data = None
+    if orjson is not None:
+        try:
+            data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # Non-str keys or other types orjson rejects; keep stdlib behaviour
+            pass
+    if data is None:
+        data = json.dumps(payload, indent=2).encode("utf-8")
+    # Write-then-rename so readers never observe a partially written file
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# Parsed audit trails per artifact dir, reused while the files are unchanged on disk
+_TRAILS: Dict[str, Tuple[Tuple[Optional[Tuple[int, int]], ...], List[dict]]] = {}
+_TRAIL_LOCK = threading.Lock()
+
+
+def _audit_stamp(base: Path) -> Tuple[Optional[Tuple[int, int]], ...]:
+    return tuple(_file_stamp(p) for p in audit_paths(base))
 
 
-def _read_parquet(path: Path) -> Optional[pd.DataFrame]:
+def _load_audit(base: Path) -> List[dict]:
+    stamp = _audit_stamp(base)
+    cached = _TRAILS.get(str(base))
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    trail = load_audit_trail(base)
+    _TRAILS[str(base)] = (stamp, trail)
+    return trail
+
+
+def _append_audit(base: Path, entry: Dict[str, Any]) -> None:
+    """Append one entry to the audit log; the cached trail is extended in place of a re-read."""
+    with _TRAIL_LOCK:
+        before = _audit_stamp(base)
+        cached = _TRAILS.get(str(base))
+        append_audit_entry(base, entry)
+        if cached is not None and cached[0] == before:
+            # Round-trip through the log's own codec so the cache matches what a fresh read returns
+            _TRAILS[str(base)] = (_audit_stamp(base), cached[1] + [loads_json(dumps_json(entry))])
+
+
+def _read_parquet(path: Path, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """Read a parquet artifact; ``columns`` projects to the named columns that exist."""
     if not path.exists():
         return None
-    return pd.read_parquet(path)
+    return read_parquet_cached(path, columns=columns)
+
+
+def _read_parquet_head(path: Path, n: int) -> Optional[pd.DataFrame]:
+    """First ``n`` rows of a parquet artifact without decoding the rest."""
+    if not path.exists():
+        return None
+    return read_parquet_head(path, n)
+
+
+def _read_parquet_or(path: Path, fallback: Path) -> Optional[pd.DataFrame]:
+    """``path`` if it exists and has rows, else ``fallback`` (corridor artifact names)."""
+    df = _read_parquet(path)
+    if df is None or df.empty:
+        df = _read_parquet(fallback)
+    return df
+
+
+def _overlapping(df: Optional[pd.DataFrame], start_col: str, end_col: str, t0: Optional[pd.Timestamp], t1: Optional[pd.Timestamp]) -> Optional[pd.DataFrame]:
+    """Rows whose ``[start_col, end_col]`` interval overlaps ``[t0, t1]``; open bounds are unbounded."""
+    if df is None or df.empty or (t0 is None and t1 is None) or start_col not in df.columns:
+        return df
+    start = pd.to_datetime(df[start_col], format="ISO8601", utc=True, errors="coerce")
+    stop = pd.to_datetime(df[end_col], format="ISO8601", utc=True, errors="coerce") if end_col in df.columns else start
+    mask = pd.Series(True, index=df.index)
+    if t0 is not None:
+        mask &= stop.fillna(start) >= t0
+    if t1 is not None:
+        mask &= start <= t1
+    return df[mask]
+
+
+# Independent artifact reads for one request are issued concurrently; pyarrow
+# decoding and file IO release the GIL.
+_IO_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="artifact-io")
+
+
+_ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
 
+def _wants_arrow(accept: Optional[str]) -> bool:
+    return bool(accept) and _ARROW_STREAM in accept
 
-def _sha1_dict(obj: Any) -> str:
-    s = json.dumps(obj, sort_keys=True, separators=(",", ":"))
-    return hashlib.sha1(s.encode("utf-8")).hexdigest()
+
+def _arrow_response(df: pd.DataFrame) -> Response:
+    """Serialize a frame as an Arrow IPC stream for clients that negotiate it via Accept."""
+    import pyarrow as pa
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return Response(content=sink.getvalue().to_pybytes(), media_type=_ARROW_STREAM)
+
+
+def _hash_dict(obj: Any) -> str:
+    """Content fingerprint for plan_version/action_id (not a security hash).
+
+    Always hashes the canonical stdlib encoding: orjson formats floats,
+    non-ASCII text and NaN differently, which would make ids depend on
+    whether it is installed.
+    """
+    s = json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return _digest(s.encode("utf-8"))
 
 
 def _now_iso() -> str:
@@ -71,19 +208,22 @@ class Principal(BaseModel):
     train_id: str | None = None
 
 
+_ROLES = frozenset({"SC", "CREW", "OM", "DH", "AN", "ADM"})
+
+
 def _normalize_role(role: Optional[str]) -> str:
     if not role:
         return "AN"
     r = role.strip().upper()
-    return {"SC": "SC", "CREW": "CREW", "OM": "OM", "DH": "DH", "AN": "AN", "ADM": "ADM"}.get(r, "AN")
+    return r if r in _ROLES else "AN"
 
 
 def get_principal(authorization: Optional[str] = Header(default=None), x_user: Optional[str] = Header(default=None), x_role: Optional[str] = Header(default=None)) -> Principal:
-    # Prefer token-based auth if provided
+    # Prefer token-based auth if provided; header-only requests never touch the auth DB
     try:
-        from src.auth.service import get_user_by_token, init_db
-        init_db()
         if authorization and authorization.lower().startswith("bearer "):
+            from src.auth.service import get_user_by_token, init_db
+            init_db()
             token = authorization.split(" ", 1)[1].strip()
             u = get_user_by_token(token)
             if u is not None:
@@ -107,15 +247,22 @@ def get_state(
     principal: Principal = Depends(get_principal),
     train_id: Optional[str] = None,
     station_id: Optional[str] = None,
+    start_ts: Optional[str] = None,
+    end_ts: Optional[str] = None,
 ) -> Dict[str, Any]:
     base = _art_dir(scope, date)
-    plats = _read_parquet(base / "national_platform_occupancy.parquet")
-    if plats is None or (hasattr(plats, "empty") and plats.empty):
-        plats = _read_parquet(base / "platform_occupancy.parquet")
-    waits = _read_parquet(base / "national_waiting_ledger.parquet")
-    if waits is None or (hasattr(waits, "empty") and waits.empty):
-        waits = _read_parquet(base / "waiting_ledger.parquet")
+    try:
+        t0 = _as_utc(start_ts) if start_ts else None
+        t1 = _as_utc(end_ts) if end_ts else None
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid start_ts/end_ts")
+    f_plats = _IO_POOL.submit(_read_parquet_or, base / "national_platform_occupancy.parquet", base / "platform_occupancy.parquet")
+    f_waits = _IO_POOL.submit(_read_parquet_or, base / "national_waiting_ledger.parquet", base / "waiting_ledger.parquet")
+    f_rk = _IO_POOL.submit(_read_json, base / "risk_kpis.json")
+    f_pm = _IO_POOL.submit(_read_json, base / "plan_metrics.json")
     kpis = _read_json(base / "national_sim_kpis.json") or {}
+    plats = f_plats.result()
+    waits = f_waits.result()
     # Normalize KPI keys expected by frontend
     try:
         if "otp_pct" not in kpis:
@@ -127,10 +274,10 @@ def get_state(
             if v is not None:
                 kpis["avg_delay"] = float(v)
         # Global counts for admin overview
-        rk = _read_json(base / "risk_kpis.json") or {}
+        rk = f_rk.result() or {}
         if rk.get("total_risks") is not None and "total_risks" not in kpis:
             kpis["total_risks"] = float(rk.get("total_risks", 0.0))
-        pm = _read_json(base / "plan_metrics.json") or {}
+        pm = f_pm.result() or {}
         if pm.get("actions") is not None and "actions" not in kpis:
             kpis["actions"] = float(pm.get("actions", 0.0))
     except Exception:
@@ -173,21 +320,22 @@ def get_state(
                 # Count actions at station or affecting blocks touching the station
                 cnt = 0
                 if rec_plan:
-                    bo = _read_parquet(base / "national_block_occupancy.parquet")
+                    touching = _blocks_touching(base, sid)
                     for rec in rec_plan:
                         if str(rec.get("station_id","")) == sid or str(rec.get("at_station","")) == sid:
                             cnt += 1
                         else:
                             bid = rec.get("block_id")
-                            if bid and bo is not None and not bo.empty and {"block_id","u","v"}.issubset(bo.columns):
-                                g = bo[bo["block_id"].astype(str) == str(bid)]
-                                if not g.empty and ((g["u"].astype(str) == sid) | (g["v"].astype(str) == sid)).any():
-                                    cnt += 1
+                            if bid and str(bid) in touching:
+                                cnt += 1
                 kpis["actions"] = float(cnt)
             except Exception:
                 pass
     except Exception:
         pass
+    # Optional time window, applied before the row cap so only visible rows are sent
+    plats = _overlapping(plats, "arr_platform", "dep_platform", t0, t1)
+    waits = _overlapping(waits, "start_time", "end_time", t0, t1)
     return {
         "platform_occupancy": (plats.head(1000).to_dict(orient="records") if plats is not None else []),
         "waiting_ledger": (waits.head(1000).to_dict(orient="records") if waits is not None else []),
@@ -210,10 +358,10 @@ def get_snapshot(scope: str, date: str) -> Dict[str, Any]:
 @app.get("/nodes")
 def get_nodes(scope: str, date: str) -> Dict[str, Any]:
     base = _art_dir(scope, date)
-    nodes = _read_parquet(base / "section_nodes.parquet")
+    nodes = _read_parquet_head(base / "section_nodes.parquet", 2000)
     if nodes is None or nodes.empty:
         return {"nodes": []}
-    return {"nodes": nodes.head(2000).to_dict(orient="records")}
+    return {"nodes": nodes.to_dict(orient="records")}
 
 
 @app.get("/edges")
@@ -226,7 +374,8 @@ def get_edges(scope: str, date: str, station_id: Optional[str] = None) -> Dict[s
     lon_col = "lon" if "lon" in nodes.columns else ("longitude" if "longitude" in nodes.columns else None)
     if lat_col is None or lon_col is None or "station_id" not in nodes.columns:
         return {"edges": []}
-    coord = nodes.set_index("station_id")[ [lat_col, lon_col] ].to_dict(orient="index")
+    coord = nodes[["station_id", lat_col, lon_col]].astype({"station_id": str})
+    coord = coord.drop_duplicates(subset=["station_id"])
 
     edges = _read_parquet(base / "section_edges.parquet")
     if edges is None or edges.empty:
@@ -235,32 +384,28 @@ def get_edges(scope: str, date: str, station_id: Optional[str] = None) -> Dict[s
             return {"edges": []}
         cols = [c for c in ["u","v","block_id"] if c in bo.columns]
         edges = bo.drop_duplicates(subset=[c for c in ["u","v"] if c in bo.columns])[cols]
+    if not {"u", "v"}.issubset(edges.columns):
+        return {"edges": []}
 
-    if station_id and {"u","v"}.issubset(edges.columns):
+    if station_id:
         sid = str(station_id)
         edges = edges[(edges["u"].astype(str) == sid) | (edges["v"].astype(str) == sid)]
 
-    out = []
-    for _, r in edges.iterrows():
-        u = str(r.get("u", ""))
-        v = str(r.get("v", ""))
-        cu = coord.get(u)
-        cv = coord.get(v)
-        if not cu or not cv:
-            continue
-        out.append({
-            "u": u,
-            "v": v,
-            "block_id": r.get("block_id"),
-            "u_lat": float(cu.get(lat_col)),
-            "u_lon": float(cu.get(lon_col)),
-            "v_lat": float(cv.get(lat_col)),
-            "v_lon": float(cv.get(lon_col)),
-        })
-    return {"edges": out[:5000]}
+    # Attach endpoint coordinates with two joins; edges without both ends are dropped
+    e = pd.DataFrame({
+        "u": edges["u"].astype(str).to_numpy(),
+        "v": edges["v"].astype(str).to_numpy(),
+        "block_id": edges["block_id"].to_numpy() if "block_id" in edges.columns else None,
+    })
+    e = e.merge(coord.rename(columns={"station_id": "u", lat_col: "u_lat", lon_col: "u_lon"}), on="u", how="inner")
+    e = e.merge(coord.rename(columns={"station_id": "v", lat_col: "v_lat", lon_col: "v_lon"}), on="v", how="inner")
+    e = e.head(5000)
+    for c in ("u_lat", "u_lon", "v_lat", "v_lon"):
+        e[c] = e[c].astype(float)
+    return {"edges": e.to_dict(orient="records")}
 
 @app.get("/blocks")
-def get_blocks(scope: str, date: str, station_id: Optional[str] = None, principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
+def get_blocks(scope: str, date: str, station_id: Optional[str] = None, accept: Optional[str] = Header(default=None), principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
     base = _art_dir(scope, date)
     bo = _read_parquet(base / "national_block_occupancy.parquet")
     if bo is None or bo.empty:
@@ -279,6 +424,8 @@ def get_blocks(scope: str, date: str, station_id: Optional[str] = None, principa
             bo = bo[(bo["u"].astype(str) == sid) | (bo["v"].astype(str) == sid)]
     except Exception:
         pass
+    if _wants_arrow(accept):
+        return _arrow_response(bo.head(2000))
     return {"blocks": bo.head(2000).to_dict(orient="records")}
 
 @app.get("/radar")
@@ -302,23 +449,102 @@ def get_radar(scope: str, date: str, station_id: Optional[str] = None, train_id:
     if train_id:
         radar = [r for r in radar if str(train_id) in [str(t) for t in (r.get("train_ids") or [])]]
     risk_kpis = _read_json(base / "risk_kpis.json") or {}
-    return {"radar": radar, "risk_kpis": risk_kpis}
+    out: Dict[str, Any] = {"radar": radar, "risk_kpis": risk_kpis}
+    if not station_id and not train_id:
+        # Producer-side heatmap counts; only valid for the unfiltered radar
+        agg = _read_parquet(base / "conflict_radar_agg.parquet")
+        # Files from before the lead_range column leave the client to bucket rows itself
+        if agg is not None and "lead_range" in agg.columns:
+            out["radar_agg"] = agg.to_dict(orient="records")
+    return out
+
+
+@lru_cache(maxsize=16)
+def _plan_digest_cached(path: str, mtime_ns: int, size: int) -> str:
+    return _hash_dict(_read_json(Path(path)) or [])
+
+
+def _plan_digest(p: Path) -> str:
+    """Content digest of rec_plan.json ("" if missing), computed once per file version."""
+    stamp = _file_stamp(p)
+    return _plan_digest_cached(str(p), *stamp) if stamp else ""
 
 
 def _plan_with_version(base: Path) -> Tuple[List[dict], str]:
-    rec_plan: List[dict] = _read_json(base / "rec_plan.json") or []
-    plan_version = _sha1_dict(rec_plan) if rec_plan else ""
+    p = base / "rec_plan.json"
+    stamp = _file_stamp(p)
+    rec_plan: List[dict] = _read_json(p) or []
+    if not rec_plan:
+        return rec_plan, ""
+    if stamp is not None and _file_stamp(p) == stamp:
+        plan_version = _plan_digest_cached(str(p), *stamp)
+    else:
+        plan_version = _hash_dict(rec_plan)
     return rec_plan, plan_version
 
 
+def _blocks_touching(base: Path, sid: str) -> frozenset:
+    """Block ids in the national block occupancy whose ``u`` or ``v`` is station ``sid``."""
+    try:
+        bo = _read_parquet(base / "national_block_occupancy.parquet", columns=["block_id", "u", "v"])
+        if bo is None or bo.empty or not {"block_id", "u", "v"}.issubset(bo.columns):
+            return frozenset()
+        hit = (bo["u"].astype(str) == sid) | (bo["v"].astype(str) == sid)
+        return frozenset(bo.loc[hit, "block_id"].astype(str).unique())
+    except Exception:
+        return frozenset()
+
+
+@lru_cache(maxsize=16)
+def _action_ids_cached(path: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    rec_plan = _read_json(Path(path)) or []
+    return tuple(rec.get("action_id") or _hash_dict(rec) for rec in rec_plan)
+
+
+def _plan_action_ids(base: Path, rec_plan: List[dict]) -> Tuple[str, ...]:
+    """Action id per entry of ``rec_plan``; hashes are computed once per rec_plan.json version."""
+    p = base / "rec_plan.json"
+    try:
+        st = p.stat()
+        ids = _action_ids_cached(str(p), st.st_mtime_ns, st.st_size)
+    except OSError:
+        ids = ()
+    if len(ids) != len(rec_plan):
+        # File changed between reads; hash this copy directly
+        ids = tuple(rec.get("action_id") or _hash_dict(rec) for rec in rec_plan)
+    return ids
+
+
+@lru_cache(maxsize=16)
+def _action_index_cached(path: str, mtime_ns: int, size: int) -> Dict[str, int]:
+    index: Dict[str, int] = {}
+    for i, aid in enumerate(_action_ids_cached(path, mtime_ns, size)):
+        index.setdefault(str(aid), i)  # first occurrence wins
+    return index
+
+
 @app.get("/recommendations")
-def get_recommendations(scope: str, date: str, station_id: Optional[str] = None, principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
+def get_recommendations(
+    scope: str,
+    date: str,
+    station_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    principal: Principal = Depends(get_principal),
+) -> Dict[str, Any]:
     base = _art_dir(scope, date)
+    # Side artifacts are read concurrently with the plan
+    f_alts = _IO_POOL.submit(_read_json, base / "alt_options.json")
+    f_pm = _IO_POOL.submit(_read_json, base / "plan_metrics.json")
+    f_par = _IO_POOL.submit(_read_json, base / "plan_apply_report.json")
+    f_audit = _IO_POOL.submit(_read_json, base / "audit_log.json")
     rec_plan, plan_version = _plan_with_version(base)
-    alt_options = _read_json(base / "alt_options.json") or []
-    plan_metrics = _read_json(base / "plan_metrics.json") or {}
-    plan_apply_report = _read_json(base / "plan_apply_report.json")
-    audit_log = _read_json(base / "audit_log.json") or {}
+    for rec, aid in zip(rec_plan, _plan_action_ids(base, rec_plan)):
+        rec.setdefault("action_id", aid)
+    alt_options = expand_refs(f_alts.result()) or []
+    plan_metrics = f_pm.result() or {}
+    plan_apply_report = f_par.result()
+    audit_log = f_audit.result() or {}
     # Optional station filter for rec_plan
     # Enforce SC station scoping
     if principal.role == "SC":
@@ -330,28 +556,29 @@ def get_recommendations(scope: str, date: str, station_id: Optional[str] = None,
         sid = str(station_id)
         # Filter recs at station or affecting blocks touching station (best-effort using stored fields)
         filtered = []
+        touching: Optional[frozenset] = None
         for rec in rec_plan:
             if str(rec.get("station_id", "")) == sid or str(rec.get("at_station", "")) == sid:
                 filtered.append(rec)
                 continue
             bid = rec.get("block_id")
-            if bid and (base / "national_block_occupancy.parquet").exists():
-                try:
-                    bo = pd.read_parquet(base / "national_block_occupancy.parquet")
-                    g = bo[bo["block_id"].astype(str) == str(bid)]
-                    if not g.empty and ((g["u"].astype(str) == sid) | (g["v"].astype(str) == sid)).any():
-                        filtered.append(rec)
-                        continue
-                except Exception:
-                    pass
+            if bid:
+                if touching is None:
+                    touching = _blocks_touching(base, sid)
+                if str(bid) in touching:
+                    filtered.append(rec)
         rec_plan = filtered
-    # Attach action_id and ensure explainability fields
+    # Optional paging; explainability is only filled in for the returned page
+    total = len(rec_plan)
+    start = max(0, int(offset))
+    stop = total if limit is None else start + max(0, int(limit))
+    rec_plan = rec_plan[start:stop]
+    # Ensure explainability fields (action_id attached above)
     for rec in rec_plan:
-        if "action_id" not in rec:
-            rec["action_id"] = _sha1_dict(rec)
         _ensure_explainability(rec)
     return {
         "rec_plan": rec_plan,
+        "rec_total": total,
         "alt_options": alt_options,
         "plan_metrics": plan_metrics,
         "plan_apply_report": plan_apply_report,
@@ -421,14 +648,11 @@ def post_feedback(fb: Feedback, principal: Principal = Depends(get_principal)) -
     # Ensure action_id and plan_version
     action = dict(fb.action)
     if "action_id" not in action:
-        action["action_id"] = _sha1_dict(action)
-    rec_plan, plan_version = _plan_with_version(base)
-    if not plan_version:
-        plan_version = _sha1_dict(rec_plan)
+        action["action_id"] = _hash_dict(action)
+    # Only the plan's version is recorded; the digest is cached per rec_plan.json version
+    plan_version = _plan_digest(base / "rec_plan.json") or _hash_dict([])
 
-    # Append to audit_trail.json (immutable log style)
-    trail_path = base / "audit_trail.json"
-    trail = _read_json(trail_path) or []
+    # Append to the audit log (immutable, append-only)
     entry = {
         "ts": _now_iso(),
         "who": principal.user,
@@ -440,32 +664,24 @@ def post_feedback(fb: Feedback, principal: Principal = Depends(get_principal)) -
         "plan_version": plan_version,
         "action": action,
     }
-    trail.append(entry)
-    _write_json(trail_path, trail)
-
-    # Append to feedback.parquet for analytics
-    df_new = pd.DataFrame(
-        [
-            {
-                "ts": entry["ts"],
-                "user": principal.user,
-                "role": principal.role,
-                "decision": dec,
-                "reason": fb.reason,
-                "plan_version": plan_version,
-                "action_id": action.get("action_id"),
-                "modified": json.dumps(fb.modified) if fb.modified else None,
-                "action": json.dumps(action),
-            }
-        ]
+    _append_audit(base, entry)
+
+    # Append to the feedback dataset for analytics (one part file per decision)
+    append_feedback_row(
+        base,
+        {
+            "ts": entry["ts"],
+            "user": principal.user,
+            "role": principal.role,
+            "decision": dec,
+            "reason": fb.reason,
+            "plan_version": plan_version,
+            "action_id": action.get("action_id"),
+            "modified": json.dumps(fb.modified) if fb.modified else None,
+            "action": json.dumps(action),
+            **action_fields(action),
+        },
     )
-    fb_path = base / "feedback.parquet"
-    if fb_path.exists():
-        df_all = pd.read_parquet(fb_path)
-        df_all = pd.concat([df_all, df_new], ignore_index=True)
-    else:
-        df_all = df_new
-    df_all.to_parquet(fb_path, index=False)
 
     # Append to global offline RL log for HIL-RL
     try:
@@ -549,8 +765,6 @@ def post_apply(body: ApplyReq, principal: Principal = Depends(get_principal)) ->
     res = ENGINE.apply_action(body.action_id, body.modifiers)
     # Log apply intent to audit trail
     base = _art_dir(body.scope, body.date)
-    trail_path = base / "audit_trail.json"
-    trail = _read_json(trail_path) or []
     entry = {
         "ts": _now_iso(),
         "who": principal.user,
@@ -558,11 +772,10 @@ def post_apply(body: ApplyReq, principal: Principal = Depends(get_principal)) ->
         "action_id": body.action_id,
         "decision": "APPLY",
         "details": body.modifiers or {},
-        "plan_version": (_sha1_dict(_read_json(base / "rec_plan.json") or []) if (base / "rec_plan.json").exists() else ""),
+        "plan_version": _plan_digest(base / "rec_plan.json"),
         "result": res,
     }
-    trail.append(entry)
-    _write_json(trail_path, trail)
+    _append_audit(base, entry)
     return res
 
 
@@ -593,11 +806,10 @@ def post_optimize(body: OptimizeReq, principal: Principal = Depends(get_principa
         radar = _read_json(rad_p) or []
     else:
         try:
-            import pandas as pd
             from src.sim.risk import analyze, save as risk_save
-            edges = pd.read_parquet(edges_p)
-            nodes = pd.read_parquet(nodes_p)
-            bo = pd.read_parquet(block_p)
+            edges = _read_parquet(edges_p)
+            nodes = _read_parquet(nodes_p)
+            bo = _read_parquet(block_p)
             risks, timeline, previews, kpis = analyze(edges, nodes, bo, t0=(body.t0 or None), horizon_min=int(body.horizon_min))
             risk_save(risks, timeline, previews, kpis, base)
             radar = risks
@@ -613,15 +825,14 @@ def post_optimize(body: OptimizeReq, principal: Principal = Depends(get_principa
             risk_heat = None
     # Load locks and pins; run optimizer (heuristic or GA)
     try:
-        import pandas as pd
         from src.opt.engine import propose, save as opt_save
-        edges = pd.read_parquet(edges_p)
-        nodes = pd.read_parquet(nodes_p)
-        bo = pd.read_parquet(block_p)
+        edges = _read_parquet(edges_p)
+        nodes = _read_parquet(nodes_p)
+        bo = _read_parquet(block_p)
         # Backup current plan
         try:
             prev = _read_json(base / "rec_plan.json") or []
-            (base / "rec_plan_prev.json").write_text(json.dumps(prev, indent=2))
+            _write_json(base / "rec_plan_prev.json", prev)
         except Exception:
             pass
         locks = _read_json(base / "locks_state.json") or {}
@@ -639,7 +850,7 @@ def post_optimize(body: OptimizeReq, principal: Principal = Depends(get_principa
         prov["reopt_count"] = int(prov.get("reopt_count", 0)) + 1
         prov["last_reopt_ts"] = _now_iso()
         _write_json(prov_p, prov)
-        plan_version = _sha1_dict(rec) if rec else ""
+        plan_version = _hash_dict(rec) if rec else ""
         return {"status": "ok", "plan_version": plan_version, "plan_metrics": metrics, "audit": audit}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"opt: {e}")
@@ -752,7 +963,7 @@ def post_disruption(body: DisruptionReq, principal: Principal = Depends(get_prin
         from src.sim.risk import analyze as risk_analyze, save as risk_save
         from src.opt.engine import propose, save as opt_save
 
-        ev = pd.read_parquet(events_p)
+        ev = _read_parquet(events_p)
         # Ensure tz-aware columns
         for c in ("sched_dep", "act_dep"):
             if c in ev.columns:
@@ -769,8 +980,8 @@ def post_disruption(body: DisruptionReq, principal: Principal = Depends(get_prin
         ev.to_parquet(events_p, index=False)
 
         # Recompute replay
-        edges = pd.read_parquet(edges_p)
-        nodes = pd.read_parquet(nodes_p)
+        edges = _read_parquet(edges_p)
+        nodes = _read_parquet(nodes_p)
         graph = load_graph(nodes, edges)
         sim = replay_run(ev, graph)
         replay_save(sim, base)
@@ -782,7 +993,7 @@ def post_disruption(body: DisruptionReq, principal: Principal = Depends(get_prin
         # Backup current plan
         try:
             prev = _read_json(base / "rec_plan.json") or []
-            (base / "rec_plan_prev.json").write_text(json.dumps(prev, indent=2))
+            _write_json(base / "rec_plan_prev.json", prev)
         except Exception:
             pass
         locks = _read_json(base / "locks_state.json") or {}
@@ -814,13 +1025,23 @@ def post_disruption(body: DisruptionReq, principal: Principal = Depends(get_prin
 @app.get("/plan/{plan_id}")
 def get_plan(plan_id: str, scope: str, date: str) -> Dict[str, Any]:
     base = _art_dir(scope, date)
-    rec_plan = _read_json(base / "rec_plan.json") or []
+    p = base / "rec_plan.json"
+    stamp = _file_stamp(p)
+    rec_plan = _read_json(p) or []
     if plan_id in ("", "latest"):
-        return {"plan_id": _sha1_dict(rec_plan) if rec_plan else "", "rec_plan": rec_plan}
-    # Try action lookup
-    for rec in rec_plan:
-        if str(rec.get("action_id", "")) == plan_id:
+        return {"plan_id": _hash_dict(rec_plan) if rec_plan else "", "rec_plan": rec_plan}
+    # Action lookup by id (explicit or the content hash /recommendations assigns)
+    if stamp is not None and stamp == _file_stamp(p):
+        i = _action_index_cached(str(p), *stamp).get(plan_id)
+        if i is not None and i < len(rec_plan):
+            rec = rec_plan[i]
+            rec.setdefault("action_id", plan_id)
             return {"action": rec}
+    else:
+        for rec, aid in zip(rec_plan, _plan_action_ids(base, rec_plan)):
+            if str(aid) == plan_id:
+                rec.setdefault("action_id", aid)
+                return {"action": rec}
     raise HTTPException(status_code=404, detail="plan/action not found")
 
 
@@ -840,7 +1061,7 @@ def revert_plan(body: RevertReq, principal: Principal = Depends(get_principal))
     try:
         data = _read_json(prev_p) or []
         _write_json(cur_p, data)
-        return {"status": "ok", "plan_version": _sha1_dict(data)}
+        return {"status": "ok", "plan_version": _hash_dict(data)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -848,21 +1069,22 @@ def revert_plan(body: RevertReq, principal: Principal = Depends(get_principal))
 @app.get("/sectionTopology")
 def get_section_topology(scope: str, date: str) -> Dict[str, Any]:
     base = _art_dir(scope, date)
-    import pandas as pd
-    nodes = pd.read_parquet(base / "section_nodes.parquet") if (base / "section_nodes.parquet").exists() else None
-    edges = pd.read_parquet(base / "section_edges.parquet") if (base / "section_edges.parquet").exists() else None
+    nodes = _read_parquet_head(base / "section_nodes.parquet", 2000)
+    edges = _read_parquet_head(base / "section_edges.parquet", 5000)
     return {
-        "nodes": ([] if nodes is None or nodes.empty else nodes.head(2000).to_dict(orient="records")),
-        "edges": ([] if edges is None or edges.empty else edges.head(5000).to_dict(orient="records")),
+        "nodes": ([] if nodes is None or nodes.empty else nodes.to_dict(orient="records")),
+        "edges": ([] if edges is None or edges.empty else edges.to_dict(orient="records")),
     }
 
 
 @app.get("/timetable")
-def get_timetable(scope: str, date: str) -> Dict[str, Any]:
+def get_timetable(scope: str, date: str, accept: Optional[str] = Header(default=None)) -> Dict[str, Any]:
     base = _art_dir(scope, date)
     import pandas as pd
-    ev = pd.read_parquet(base / "events_clean.parquet") if (base / "events_clean.parquet").exists() else None
-    return {"events": ([] if ev is None or ev.empty else ev.head(2000).to_dict(orient="records"))}
+    ev = _read_parquet_head(base / "events_clean.parquet", 2000)
+    if _wants_arrow(accept):
+        return _arrow_response(ev if ev is not None else pd.DataFrame())
+    return {"events": ([] if ev is None or ev.empty else ev.to_dict(orient="records"))}
 
 
 # ---------- Locks & Pins ----------
@@ -1033,36 +1255,49 @@ def admin_change_train(username: str, body: TrainChange, principal: Principal =
 def audit_trail(scope: str, date: str, principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
     # Read-only for all roles
     base = _art_dir(scope, date)
-    trail = _read_json(base / "audit_trail.json") or []
+    trail = _load_audit(base)
     return {"audit_trail": trail}
 
 
 @app.get("/audit")
 def audit_range(scope: str, date: str, start_ts: Optional[str] = None, end_ts: Optional[str] = None) -> Dict[str, Any]:
     base = _art_dir(scope, date)
-    trail = _read_json(base / "audit_trail.json") or []
-    if start_ts or end_ts:
-        from pandas import to_datetime
-        s = to_datetime(start_ts) if start_ts else None
-        e = to_datetime(end_ts) if end_ts else None
-        out = []
-        for x in trail:
-            try:
-                ts = to_datetime(x.get("ts"))
-                if (s is None or ts >= s) and (e is None or ts <= e):
-                    out.append(x)
-            except Exception:
-                continue
-        trail = out
+    # Bounds without an offset are taken as UTC (entries are written in UTC)
+    try:
+        t0 = _as_utc(start_ts) if start_ts else None
+        t1 = _as_utc(end_ts) if end_ts else None
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid start_ts/end_ts")
+    trail = _load_audit(base)
+    if (t0 is not None or t1 is not None) and trail:
+        # One vectorised ISO-8601 parse; unparsable or missing ts never match
+        ts = pd.to_datetime(
+            pd.Series([x.get("ts") for x in trail], dtype=object),
+            format="ISO8601", utc=True, errors="coerce",
+        )
+        keep = ts.notna()
+        if t0 is not None:
+            keep &= ts >= t0
+        if t1 is not None:
+            keep &= ts <= t1
+        trail = [x for x, k in zip(trail, keep.tolist()) if k]
     return {"audit": trail}
 
 
+def _as_utc(value: str) -> pd.Timestamp:
+    t = pd.Timestamp(value)
+    return t.tz_localize("UTC") if t.tzinfo is None else t.tz_convert("UTC")
+
+
+_DECISIONS = frozenset({"APPLY", "DISMISS", "MODIFY", "ACK"})
+
+
 @app.get("/audit/completeness")
 def audit_completeness(scope: str, date: str) -> Dict[str, Any]:
     base = _art_dir(scope, date)
     rec_plan = _read_json(base / "rec_plan.json") or []
-    trail = _read_json(base / "audit_trail.json") or []
-    acted = len([e for e in trail if e.get("decision") in ("APPLY", "DISMISS", "MODIFY", "ACK")])
+    trail = _load_audit(base)
+    acted = sum(1 for e in trail if e.get("decision") in _DECISIONS)
     total = len(rec_plan)
     pct = (acted / total * 100.0) if total else 0.0
     return {"recommendations": total, "decisions_logged": acted, "completeness_pct": pct}
@@ -1106,14 +1341,15 @@ def set_policy(scope: str, date: str, policy: Policy, principal: Principal = Dep
 
 # ---------- Predictive Models ----------
 @app.post("/admin/train_eta")
-def admin_train_eta(scope: str, date: str, principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
+def admin_train_eta(scope: str, date: str, background: bool = False, principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
     require_roles(principal, ("ADM", "OM", "DH"))
-    try:
+
+    def _job() -> Dict[str, Any]:
         from src.learn.eta import train_eta
         rep = train_eta(scope, date)
         return {"status": rep.get("status", "ok"), "report": rep}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+    return _run_job("train_eta", _job, background)
 
 
 @app.get("/predict/eta")
@@ -1142,14 +1378,15 @@ def predict_eta_importance(scope: str, date: str) -> Dict[str, Any]:
 
 
 @app.post("/admin/build_incident_risk")
-def admin_build_incident_risk(scope: str, date: str, principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
+def admin_build_incident_risk(scope: str, date: str, background: bool = False, principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
     require_roles(principal, ("ADM", "OM", "DH"))
-    try:
+
+    def _job() -> Dict[str, Any]:
         from src.learn.incident_risk import train_incident_risk
         rep = train_incident_risk(scope, date)
         return {"status": rep.get("status", "ok"), "report": rep}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+    return _run_job("build_incident_risk", _job, background)
 
 
 @app.get("/risk/heatmap")
@@ -1165,37 +1402,104 @@ class TrainResp(BaseModel):
     details: Dict[str, Any] | None = None
 
 
+# Long-running admin jobs can be queued with ``background=true`` and polled
+# via /admin/jobs/{job_id} instead of holding the request open.
+# The registry lives in this process: run the API with a single worker (the
+# default) or a poll may reach a worker that never saw the job and get 404.
+# Finished jobs are kept for ``_JOB_TTL_SEC`` and at most ``_MAX_FINISHED_JOBS``
+# of them are retained; running jobs are never evicted.
+_JOB_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="admin-job")
+_JOBS: OrderedDict[str, Tuple[str, Future]] = OrderedDict()
+_JOB_DONE_AT: Dict[str, float] = {}
+_JOBS_LOCK = threading.Lock()
+_JOB_TTL_SEC = 3600.0
+_MAX_FINISHED_JOBS = 64
+
+
+def _prune_jobs(now: float) -> None:
+    """Drop expired and surplus finished jobs, oldest first (caller holds the lock)."""
+    finished = [jid for jid in _JOBS if jid in _JOB_DONE_AT]
+    surplus = len(finished) - _MAX_FINISHED_JOBS
+    for jid in finished:
+        if surplus > 0 or now - _JOB_DONE_AT[jid] > _JOB_TTL_SEC:
+            _JOBS.pop(jid, None)
+            _JOB_DONE_AT.pop(jid, None)
+            surplus -= 1
+
+
+def _run_job(name: str, fn: Callable[[], Dict[str, Any]], background: bool) -> Dict[str, Any]:
+    if not background:
+        try:
+            return fn()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    job_id = uuid.uuid4().hex
+
+    def _done(_: Future) -> None:
+        with _JOBS_LOCK:
+            if job_id in _JOBS:
+                _JOB_DONE_AT[job_id] = time.monotonic()
+
+    with _JOBS_LOCK:
+        _prune_jobs(time.monotonic())
+        fut = _JOB_POOL.submit(fn)
+        _JOBS[job_id] = (name, fut)
+    # Registered outside the lock: it runs inline if the job already finished
+    fut.add_done_callback(_done)
+    return {"status": "queued", "job_id": job_id, "job": name}
+
+
+@app.get("/admin/jobs/{job_id}")
+def admin_job_status(job_id: str, principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
+    require_roles(principal, ("ADM", "OM", "DH"))
+    with _JOBS_LOCK:
+        _prune_jobs(time.monotonic())
+        entry = _JOBS.get(job_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Job not found (unknown, expired, or queued on another worker)")
+    name, fut = entry
+    if not fut.done():
+        return {"job_id": job_id, "job": name, "status": "running" if fut.running() else "queued"}
+    exc = fut.exception()
+    if exc is not None:
+        return {"job_id": job_id, "job": name, "status": "error", "error": str(exc)}
+    return {"job_id": job_id, "job": name, "status": "done", "result": fut.result()}
+
+
 @app.post("/admin/train_global")
-def admin_train_global(principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
+def admin_train_global(background: bool = False, principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
     require_roles(principal, ("ADM", "OM", "DH"))
-    try:
+
+    def _job() -> Dict[str, Any]:
         from src.learn.train_corpus import train_global
         rep = train_global("artifacts")
         return {"status": rep.get("status", "ok"), "report": rep}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+    return _run_job("train_global", _job, background)
 
 
 @app.post("/admin/build_offline_rl")
-def admin_build_offline_rl(alpha: float = 0.2, principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
+def admin_build_offline_rl(alpha: float = 0.2, background: bool = False, principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
     require_roles(principal, ("ADM", "OM", "DH"))
-    try:
+
+    def _job() -> Dict[str, Any]:
         from src.learn.offline_rl import build_offline_rl
         p = build_offline_rl("artifacts", alpha=alpha)
         return {"status": "ok", "path": str(p)}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+    return _run_job("build_offline_rl", _job, background)
 
 
 @app.post("/admin/train_offrl")
-def admin_train_offrl(principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
+def admin_train_offrl(background: bool = False, principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
     require_roles(principal, ("ADM", "OM", "DH"))
-    try:
+
+    def _job() -> Dict[str, Any]:
         from src.learn.train_offrl import train_offrl
         rep = train_offrl("artifacts")
         return {"status": rep.get("status", "ok"), "report": rep}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+    return _run_job("train_offrl", _job, background)
 
 
 @app.get("/admin/eval_offline")
@@ -1210,14 +1514,15 @@ def admin_eval_offline(topk: int = 1, principal: Principal = Depends(get_princip
 
 
 @app.post("/admin/train_il_torch")
-def admin_train_il_torch(principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
+def admin_train_il_torch(background: bool = False, principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
     require_roles(principal, ("ADM", "OM", "DH"))
-    try:
+
+    def _job() -> Dict[str, Any]:
         from src.learn.policy_torch import train_torch
         rep = train_torch("artifacts")
         return {"status": rep.get("status", "ok"), "report": rep}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+    return _run_job("train_il_torch", _job, background)
 
 
 # ---------- Crew feed ----------
@@ -1230,22 +1535,34 @@ def crew_feed(scope: str, date: str, train_id: Optional[str] = None, principal:
         else:
             raise HTTPException(status_code=400, detail="CREW account has no train assignment")
     base = _art_dir(scope, date)
-    rec_plan = _read_json(base / "rec_plan.json") or []
-    # Filter and simplify for crew consumption
+    p = base / "rec_plan.json"
+    stamp = _file_stamp(p)
+    items = _crew_items_cached(str(p), *stamp) if stamp else ()
+    if train_id:
+        items = tuple(it for it in items if str(it["train_id"]) == str(train_id))
+    return {"instructions": [dict(it) for it in items]}
+
+
+_CREW_TYPES = frozenset({"HOLD", "PLATFORM_REASSIGN", "SPEED_TUNE"})
+
+
+@lru_cache(maxsize=16)
+def _crew_items_cached(path: str, mtime_ns: int, size: int) -> Tuple[Dict[str, Any], ...]:
+    """Crew instructions for one rec_plan.json version (filtered and summarised once)."""
+    base = Path(path).parent
+    rec_plan = _read_json(Path(path)) or []
     items = []
-    for rec in rec_plan:
-        if train_id and str(rec.get("train_id")) != str(train_id):
-            continue
-        if rec.get("type") not in ("HOLD", "PLATFORM_REASSIGN", "SPEED_TUNE"):
+    for rec, aid in zip(rec_plan, _plan_action_ids(base, rec_plan)):
+        if rec.get("type") not in _CREW_TYPES:
             continue
         items.append(
             {
-                "action_id": rec.get("action_id") or _sha1_dict(rec),
+                "action_id": aid,
                 "train_id": rec.get("train_id"),
                 "summary": _crew_summary(rec),
             }
         )
-    return {"instructions": items}
+    return tuple(items)
 
 
 def _crew_summary(rec: Dict[str, Any]) -> str:
@@ -6,13 +6,15 @@ Supports: KPIs, risk summaries, ETAs for a train, and action suggestions
 by delegating to ``src.policy.infer.suggest``.
 """
 
+from collections import Counter
 from pathlib import Path
 from typing import Dict, Optional, List
-import json
 import re
 
 import pandas as pd
 
+from src.data.cache import read_parquet_cached, read_twin_cached
+from src.data.serdes import loads_json
 from src.policy.infer import suggest as suggest_actions
 
 
@@ -24,25 +26,26 @@ def _read_json(p: Path) -> object | None:
     try:
         if not p.exists():
             return None
-        return json.loads(p.read_text())
+        return loads_json(p.read_bytes())
     except Exception:
         return None
 
 
-def _load_df(p: Path) -> pd.DataFrame:
+def _load_df(p: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
     if not p.exists():
         return pd.DataFrame()
-    return pd.read_parquet(p)
+    return read_parquet_cached(p, columns=columns)
+
+
+_ETA_COLS = ["train_id", "station_id", "arr_platform", "dep_platform"]
+# Radar fields used by the risk summary
+_RADAR_COLS = ["type", "severity", "lead_min", "block_id", "station_id", "u", "v"]
 
 
 def answer(scope: str, date: str, query: str, *, role: str = "AN", train_id: Optional[str] = None, station_id: Optional[str] = None) -> Dict[str, object]:
     base = _base(scope, date)
     q = (query or "").strip().lower()
     sim = _read_json(base / "national_sim_kpis.json") or {}
-    radar = _read_json(base / "conflict_radar.json") or []
-    df_plat = _load_df(base / "national_platform_occupancy.parquet")
-    if df_plat.empty:
-        df_plat = _load_df(base / "platform_occupancy.parquet")
 
     # OTP / delay queries
     if re.search(r"\b(otp|on[-\s]?time)\b", q) or re.search(r"\bdelay\b", q):
@@ -56,14 +59,32 @@ def answer(scope: str, date: str, query: str, *, role: str = "AN", train_id: Opt
 
     # Risks summary
     if "risk" in q or "conflict" in q:
-        # optional station filter for SC
-        rs: List[dict] = radar
-        if station_id:
-            sid = str(station_id)
-            rs = [r for r in radar if str(r.get("station_id", "")) == sid or str(r.get("u", "")) == sid or str(r.get("v", "")) == sid]
-        crit = sum(1 for r in rs if r.get("severity") == "Critical")
-        high = sum(1 for r in rs if r.get("severity") == "High")
-        total = len(rs)
+        radar_p = base / "conflict_radar.json"
+        twin = read_twin_cached(radar_p, columns=_RADAR_COLS)
+        if twin is not None:
+            # Columnar twin: filter and count without materialising every risk dict
+            df = twin.reindex(columns=_RADAR_COLS)
+            if station_id:
+                sid = str(station_id)
+                keep = (df["station_id"].astype(str) == sid) | (df["u"].astype(str) == sid) | (df["v"].astype(str) == sid)
+                df = df[keep]
+            rs: List[dict] = [
+                {k: v for k, v in r.items() if v is not None and v == v}
+                for r in df.head(5).to_dict(orient="records")
+            ]
+            sev_counts = Counter(df["severity"].value_counts().to_dict())
+            total = len(df)
+        else:
+            # optional station filter for SC
+            radar = _read_json(radar_p) or []
+            rs = radar
+            if station_id:
+                sid = str(station_id)
+                rs = [r for r in radar if str(r.get("station_id", "")) == sid or str(r.get("u", "")) == sid or str(r.get("v", "")) == sid]
+            sev_counts = Counter(r.get("severity") for r in rs)
+            total = len(rs)
+        crit = sev_counts["Critical"]
+        high = sev_counts["High"]
         top = []
         for r in rs[:5]:
             loc = r.get("block_id") or r.get("station_id")
@@ -79,12 +100,19 @@ def answer(scope: str, date: str, query: str, *, role: str = "AN", train_id: Opt
     tid = train_id or (m.group(1) if m else None)
     if tid and ("eta" in q or "next" in q or "where" in q):
         try:
-            dfc = df_plat.copy()
-            if not dfc.empty:
-                dfc["arr_platform"] = pd.to_datetime(dfc["arr_platform"], utc=True)
-                dfc["dep_platform"] = pd.to_datetime(dfc["dep_platform"], utc=True)
+            # Only the ETA path needs platform occupancy, and only these columns of it
+            df_plat = _load_df(base / "national_platform_occupancy.parquet", columns=_ETA_COLS)
+            if df_plat.empty:
+                df_plat = _load_df(base / "platform_occupancy.parquet", columns=_ETA_COLS)
+            if not df_plat.empty:
+                # Narrow to this train before parsing timestamps; the full table is large
+                dfc = df_plat[df_plat["train_id"].astype(str) == str(tid)]
+                dfc = dfc.assign(
+                    arr_platform=pd.to_datetime(dfc["arr_platform"], utc=True, errors="coerce"),
+                    dep_platform=pd.to_datetime(dfc["dep_platform"], utc=True, errors="coerce"),
+                )
                 now = pd.Timestamp.utcnow().tz_localize("UTC")
-                nxt = dfc[(dfc["train_id"].astype(str) == str(tid)) & (dfc["dep_platform"] >= now)].sort_values("arr_platform").head(2)
+                nxt = dfc[dfc["dep_platform"] >= now].nsmallest(2, "arr_platform")
                 if not nxt.empty:
                     recs = nxt[["station_id", "arr_platform", "dep_platform"]].to_dict(orient="records")
                     return {"answer": f"Next stops for {tid}", "details": recs, "role_view": "crew"}
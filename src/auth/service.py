@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import secrets
 import hashlib
+import threading
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -12,7 +13,24 @@ from .db import ENGINE, SessionLocal, Base
 from .models import User, SessionToken
 
 
+_DB_READY = False
+_DB_LOCK = threading.Lock()
+
+
 def init_db() -> None:
+    # Schema creation and the column migration only need to run once per process;
+    # request handlers call this on every request.
+    global _DB_READY
+    if _DB_READY:
+        return
+    with _DB_LOCK:
+        if _DB_READY:
+            return
+        _init_schema()
+        _DB_READY = True
+
+
+def _init_schema() -> None:
     Base.metadata.create_all(bind=ENGINE)
     # Lightweight migration: ensure users.station_id exists
     try:
@@ -100,15 +118,23 @@ def get_user_by_token(token: str, *, db: Optional[Session] = None) -> Optional[U
         db = SessionLocal()
         close = True
     try:
-        sess = db.execute(select(SessionToken).where(SessionToken.token == token)).scalar_one_or_none()
-        if not sess:
+        # Session and user in one round trip; this runs on every authenticated request
+        row = db.execute(
+            select(SessionToken, User).join(User, User.id == SessionToken.user_id).where(SessionToken.token == token)
+        ).one_or_none()
+        if not row:
             return None
-        if sess.expires_at and sess.expires_at < datetime.now(timezone.utc):
+        sess, user = row
+        exp = sess.expires_at
+        if exp is not None and exp.tzinfo is None:
+            # SQLite drops tzinfo; stored values are UTC
+            exp = exp.replace(tzinfo=timezone.utc)
+        if exp and exp < datetime.now(timezone.utc):
             # Expired: cleanup
             db.execute(delete(SessionToken).where(SessionToken.id == sess.id))
             db.commit()
             return None
-        return db.execute(select(User).where(User.id == sess.user_id)).scalar_one()
+        return user
     finally:
         if close:
             db.close()
@@ -0,0 +1,132 @@
+"""Process-local cache for parquet artifacts.
+
+Artifacts under ``artifacts/<scope>/<date>/`` are rewritten in place by the
+pipeline, so cached frames are keyed on the file's ``(mtime_ns, size)``
+stamp: an unchanged file is decoded once, a rewritten one is re-read.
+
+Some JSON record artifacts (``rec_plan.json``, ``conflict_radar.json``) have a
+parquet twin written next to them by their producer. The twin records the
+JSON's ``(mtime_ns, size)`` stamp in its schema metadata and
+``read_twin_cached`` returns it only while that still matches the JSON, since
+the API rewrites the JSON in place without touching the twin.
+
+Endpoints that only ever return the first ``n`` rows of a large artifact use
+``read_parquet_head``, which stops decoding once ``n`` rows have been read.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+__all__ = ["read_parquet_cached", "read_parquet_head", "write_twin", "read_twin_cached"]
+
+
+@lru_cache(maxsize=32)
+def _load(path: str, mtime_ns: int, size: int, columns: Optional[Tuple[str, ...]]) -> pd.DataFrame:
+    return pd.read_parquet(path, columns=list(columns) if columns is not None else None)
+
+
+def read_parquet_cached(path: str | Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Read ``path`` through the cache, returning a private copy of the frame.
+
+    ``columns`` projects the read; only names present in the file schema are
+    requested. Raises ``FileNotFoundError`` if ``path`` does not exist.
+    """
+    p = Path(path)
+    st = p.stat()
+    cols: Optional[Tuple[str, ...]] = None
+    if columns is not None:
+        import pyarrow.parquet as pq
+
+        names = set(pq.read_schema(p).names)
+        cols = tuple(c for c in columns if c in names)
+    return _load(str(p), st.st_mtime_ns, st.st_size, cols).copy()
+
+
+@lru_cache(maxsize=32)
+def _load_head(path: str, mtime_ns: int, size: int, n: int) -> pd.DataFrame:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(path)
+    batches = []
+    rows = 0
+    for batch in pf.iter_batches(batch_size=max(1, min(n, 65536))):
+        batches.append(batch)
+        rows += batch.num_rows
+        if rows >= n:
+            break
+    # Keep the file schema (and its pandas metadata) so dtypes match a full read
+    table = pa.Table.from_batches(batches, schema=pf.schema_arrow).slice(0, n)
+    return table.to_pandas()
+
+
+def read_parquet_head(path: str | Path, n: int) -> pd.DataFrame:
+    """First ``n`` rows of ``path`` (as ``read_parquet(path).head(n)``), cached.
+
+    Raises ``FileNotFoundError`` if ``path`` does not exist.
+    """
+    p = Path(path)
+    st = p.stat()
+    return _load_head(str(p), st.st_mtime_ns, st.st_size, int(n)).copy()
+
+
+_TWIN_STAMP_KEY = b"twin_of_json_stamp"
+
+
+def _twin(json_path: Path) -> Path:
+    return json_path.with_suffix(".parquet")
+
+
+def _json_stamp(json_path: Path) -> bytes:
+    st = json_path.stat()
+    return f"{st.st_mtime_ns}:{st.st_size}".encode()
+
+
+def write_twin(records: List[dict], json_path: str | Path) -> None:
+    """Write ``records`` as the parquet twin of ``json_path`` (best-effort).
+
+    Call after ``json_path`` has been written: the twin is tied to its current
+    stamp. Records whose fields cannot be typed column-wise leave no twin
+    behind, so readers fall back to the JSON.
+    """
+    import os
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    jp = Path(json_path)
+    twin = _twin(jp)
+    tmp = twin.with_name(f".{twin.name}.tmp")
+    try:
+        # Union of keys across records (from_pylist would take the first record's only)
+        keys = list(dict.fromkeys(k for r in records for k in r))
+        table = pa.Table.from_pydict({k: [r.get(k) for r in records] for k in keys})
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _TWIN_STAMP_KEY: _json_stamp(jp)})
+        pq.write_table(table, tmp)
+        os.replace(tmp, twin)
+    except Exception:
+        for f in (tmp, twin):
+            try:
+                f.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def read_twin_cached(json_path: str | Path, columns: Optional[Sequence[str]] = None) -> Optional[pd.DataFrame]:
+    """Cached parquet twin of ``json_path``, or ``None`` if missing or stale."""
+    import pyarrow.parquet as pq
+
+    jp = Path(json_path)
+    twin = _twin(jp)
+    try:
+        meta = pq.read_schema(twin).metadata or {}
+        if meta.get(_TWIN_STAMP_KEY) != _json_stamp(jp):
+            return None
+        return read_parquet_cached(twin, columns=columns)
+    except Exception:
+        # Missing or unreadable twin; callers fall back to the JSON
+        return None
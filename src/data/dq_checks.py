@@ -123,7 +123,7 @@ def run_all(
 
     # ------------------------------------------------------------------
     # Missing edge check based on observed temporal order per train
-    edge_set = {(row["u"], row["v"]) for _, row in edges_df.iterrows()}
+    edge_set = set(zip(edges_df["u"].tolist(), edges_df["v"].tolist()))
     for train_id, grp in df_slice.groupby("train_id"):
         grp_ref = ref_time.loc[grp.index]
         valid_idx = grp_ref.dropna().sort_values().index
@@ -0,0 +1,127 @@
+"""Reference-table JSON encoding for artifacts with repeated sub-objects.
+
+``dumps_dedup`` stores the first occurrence of every nested dict that repeats
+in a ``"__refs__"`` table and replaces each occurrence with ``{"$ref": id}``;
+``loads_dedup`` expands them again. Payloads without a ``"__refs__"`` table are
+returned unchanged, so plain JSON artifacts stay readable through the same path.
+
+``loads_json`` / ``dumps_json`` are the plain codecs, using ``orjson`` when it
+is installed.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict
+
+__all__ = ["REFS_KEY", "dumps_dedup", "loads_dedup", "expand_refs", "loads_json", "dumps_json"]
+
+REFS_KEY = "__refs__"
+_REF = "$ref"
+_DATA = "data"
+
+try:  # Optional dependency; fall back to blake2b
+    import xxhash  # type: ignore
+
+    def _digest(b: bytes) -> str:
+        return xxhash.xxh3_64_hexdigest(b)
+except Exception:  # pragma: no cover
+    import hashlib
+
+    def _digest(b: bytes) -> str:
+        return hashlib.blake2b(b, digest_size=8).hexdigest()
+
+
+try:  # Optional dependency; fall back to stdlib json
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def loads_json(raw: str | bytes) -> Any:
+    """Parse JSON text; accepts the NaN/Infinity literals older artifacts contain."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def dumps_json(obj: Any, *, newline: bool = False) -> bytes:
+    """Compact UTF-8 JSON; unknown types are written via ``str``."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_APPEND_NEWLINE if newline else 0)
+        except TypeError:
+            pass  # e.g. non-str keys; keep stdlib behaviour
+    out = json.dumps(obj, separators=(",", ":"), default=str)
+    return (out + "\n" if newline else out).encode("utf-8")
+
+
+def _key(d: Dict[str, Any]) -> str:
+    return _digest(json.dumps(d, sort_keys=True, separators=(",", ":"), default=str).encode())
+
+
+def dumps_dedup(obj: Any, *, indent: int | None = None) -> str:
+    """Serialize ``obj`` with repeated dicts hoisted into a reference table."""
+    counts: Dict[str, int] = {}
+    keys: Dict[int, str] = {}
+
+    def _count(o: Any) -> None:
+        if isinstance(o, dict):
+            k = _key(o)
+            keys[id(o)] = k
+            counts[k] = counts.get(k, 0) + 1
+            if counts[k] > 1:
+                return  # children were already counted on first sighting
+            for v in o.values():
+                _count(v)
+        elif isinstance(o, list):
+            for v in o:
+                _count(v)
+
+    _count(obj)
+    refs: Dict[str, Any] = {}
+
+    def _encode(o: Any, top: bool = False) -> Any:
+        if isinstance(o, dict):
+            k = keys[id(o)]
+            if not top and k in refs:
+                # Later copies of a hoisted dict: their children were never
+                # counted (nor keyed), so do not descend into them
+                return {_REF: k}
+            body = {kk: _encode(v) for kk, v in o.items()}
+            if top or counts.get(k, 0) < 2:
+                return body
+            refs[k] = body
+            return {_REF: k}
+        if isinstance(o, list):
+            return [_encode(v) for v in o]
+        return o
+
+    data = _encode(obj, top=True)
+    return json.dumps({REFS_KEY: refs, _DATA: data}, indent=indent)
+
+
+def expand_refs(payload: Any) -> Any:
+    """Resolve a parsed ``dumps_dedup`` payload; other payloads pass through."""
+    if not (isinstance(payload, dict) and REFS_KEY in payload and _DATA in payload):
+        return payload
+    refs: Dict[str, Any] = payload[REFS_KEY]
+
+    def _decode(o: Any) -> Any:
+        if isinstance(o, dict):
+            if len(o) == 1 and _REF in o:
+                return _decode(refs[o[_REF]])
+            return {k: _decode(v) for k, v in o.items()}
+        if isinstance(o, list):
+            return [_decode(v) for v in o]
+        return o
+
+    return _decode(payload[_DATA])
+
+
+def loads_dedup(s: str | bytes) -> Any:
+    """Inverse of :func:`dumps_dedup`; plain JSON is returned as parsed."""
+    return expand_refs(loads_json(s))
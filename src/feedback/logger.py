@@ -1,36 +1,248 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional
 import json
+import os
+import threading
+import time
+import uuid
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.data.serdes import dumps_json, loads_json
+
+try:  # POSIX advisory file locks; elsewhere only this process is serialised
+    import fcntl  # type: ignore
+except Exception:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+# Feedback rows are appended as small part files under ``<base>/feedback/`` so a
+# click never re-reads the history; ``feedback.parquet`` holds compacted rows.
+# Readers hold a shared lock on ``feedback/.lock`` while listing and reading,
+# compaction an exclusive one, so no reader sees a row both in the compacted
+# file and in its part, or a part that has just been folded away.
+FEEDBACK_FILE = "feedback.parquet"
+FEEDBACK_PARTS_DIR = "feedback"
+_LOCK_FILE = ".lock"
+_COMPACT_AFTER = 128
+_COMPACT_LOCK = threading.Lock()
+
+
+@contextmanager
+def _feedback_lock(base: Path, exclusive: bool) -> Iterator[None]:
+    parts = base / FEEDBACK_PARTS_DIR
+    if not parts.is_dir():
+        # No parts: nothing can be compacted under the reader
+        yield
+        return
+    if fcntl is None:
+        with _COMPACT_LOCK:
+            yield
+        return
+    with (parts / _LOCK_FILE).open("a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def feedback_paths(base: Path) -> List[Path]:
+    """Compacted file (if any) followed by part files in write order."""
+    out: List[Path] = []
+    if (base / FEEDBACK_FILE).exists():
+        out.append(base / FEEDBACK_FILE)
+    parts = base / FEEDBACK_PARTS_DIR
+    if parts.is_dir():
+        out.extend(sorted(parts.glob("part-*.parquet")))
+    return out
+
+
+def _concat_tables(tables: List[pa.Table]) -> pa.Table:
+    # Parts may differ in columns (legacy rows), carry all-null columns, or use
+    # large_string where pandas wrote them and string where pyarrow did
+    try:
+        return pa.concat_tables(tables, promote_options="permissive")
+    except TypeError:  # pyarrow < 14
+        return pa.concat_tables(tables, promote=True)
+
+
+def _load_table(paths: List[Path], columns: Optional[List[str]] = None) -> Optional[pa.Table]:
+    tables = []
+    for p in paths:
+        cols = None
+        if columns is not None:
+            names = set(pq.read_schema(p).names)
+            cols = [c for c in columns if c in names]
+        t = pq.read_table(p, columns=cols)
+        if t.num_rows:
+            tables.append(t)
+    if not tables:
+        return None
+    return _concat_tables(tables) if len(tables) > 1 else tables[0]
+
+
+def load_feedback(base: Path, columns: Optional[List[str]] = None, *, paths: Optional[List[Path]] = None) -> pd.DataFrame:
+    """Union of compacted feedback and all part files; empty frame if none."""
+    with _feedback_lock(base, exclusive=False):
+        table = _load_table(feedback_paths(base) if paths is None else paths, columns)
+    if table is None:
+        return pd.DataFrame(columns=columns or [])
+    df = table.to_pandas()
+    if columns is not None:
+        df = df.reindex(columns=columns)
+    return df
+
+
+# Scalar fields lifted out of the ``action`` JSON so readers can group/filter
+# without a per-row json.loads; older rows only carry the JSON string.
+ACTION_COLUMNS = ["action_type", "train_id", "loc", "minutes"]
+
+
+def action_fields(action: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Typed feedback columns for one action dict."""
+    a = action or {}
+    loc = a.get("block_id") or a.get("station_id") or a.get("at_station")
+    mins = a.get("minutes")
+    try:
+        mins = float(mins) if mins is not None else None
+    except (TypeError, ValueError):
+        mins = None
+    return {
+        "action_type": str(a.get("type") or "UNKNOWN"),
+        "train_id": str(a["train_id"]) if a.get("train_id") is not None else None,
+        "loc": str(loc) if loc is not None else None,
+        "minutes": mins,
+    }
+
+
+def feedback_actions(df: pd.DataFrame) -> pd.DataFrame:
+    """``ACTION_COLUMNS`` for each feedback row, aligned to ``df.index``.
+
+    Uses the typed columns where present and parses the ``action`` JSON only
+    for legacy rows that lack them.
+    """
+    out = df.reindex(columns=ACTION_COLUMNS)
+    legacy = out["action_type"].isna()
+    if legacy.any() and "action" in df.columns:
+        def _parse(v: Any) -> Dict[str, Any]:
+            if isinstance(v, dict):
+                return v
+            try:
+                return loads_json(v) if isinstance(v, str) else {}
+            except Exception:
+                return {}
+
+        parsed = pd.DataFrame(
+            [action_fields(_parse(v)) for v in df.loc[legacy, "action"]],
+            index=out.index[legacy],
+            columns=ACTION_COLUMNS,
+        )
+        out = out.astype(object)
+        out.loc[legacy, ACTION_COLUMNS] = parsed
+    out["action_type"] = out["action_type"].fillna("UNKNOWN")
+    return out
+
+
+def append_feedback_row(base: Path, row: Dict[str, Any]) -> Path:
+    """Write one feedback row as a new part file; compacts once parts pile up."""
+    parts = base / FEEDBACK_PARTS_DIR
+    parts.mkdir(parents=True, exist_ok=True)
+    name = f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+    p = parts / name
+    # Written aside and renamed so readers never list a half-written part
+    tmp = parts / f".{name}.tmp"
+    pq.write_table(pa.Table.from_pylist([row]), tmp)
+    os.replace(tmp, p)
+    try:
+        if sum(1 for _ in parts.glob("part-*.parquet")) > _COMPACT_AFTER:
+            compact_feedback(base)
+    except Exception:
+        # Best-effort; parts remain readable uncompacted
+        pass
+    return p
+
+
+def compact_feedback(base: Path) -> None:
+    """Fold part files into ``feedback.parquet`` and remove the folded parts."""
+    with _feedback_lock(base, exclusive=True):
+        paths = feedback_paths(base)
+        parts = [p for p in paths if p.parent.name == FEEDBACK_PARTS_DIR]
+        if not parts:
+            return
+        table = _load_table(paths)
+        if table is None:
+            return
+        tmp = base / f".{FEEDBACK_FILE}.{uuid.uuid4().hex[:8]}.tmp"
+        # One contiguous chunk per column so the compacted file has a single row group
+        pq.write_table(table.combine_chunks(), tmp)
+        os.replace(tmp, base / FEEDBACK_FILE)
+        for p in parts:
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+
+
+# Audit entries are appended one JSON object per line; ``audit_trail.json`` is the
+# legacy whole-list format and is still read (first) if present.
+AUDIT_FILE = "audit_trail.jsonl"
+LEGACY_AUDIT_FILE = "audit_trail.json"
+_AUDIT_LOCK = threading.Lock()
+
+
+def audit_paths(base: Path) -> List[Path]:
+    """Legacy list file and the JSONL log, in read order."""
+    return [base / LEGACY_AUDIT_FILE, base / AUDIT_FILE]
+
+
+def load_audit_trail(base: Path) -> List[Dict[str, Any]]:
+    """All audit entries, oldest first; unparsable lines are skipped."""
+    trail: List[Dict[str, Any]] = []
+    legacy = base / LEGACY_AUDIT_FILE
+    if legacy.exists():
+        try:
+            trail.extend(loads_json(legacy.read_bytes()) or [])
+        except Exception:
+            pass
+    log = base / AUDIT_FILE
+    if log.exists():
+        with log.open("rb") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    trail.append(loads_json(line))
+                except Exception:
+                    continue
+    return trail
+
+
+def append_audit_entry(base: Path, entry: Dict[str, Any]) -> None:
+    """Append one entry to the audit log (O(1); never rewrites earlier entries)."""
+    line = dumps_json(entry, newline=True)
+    with _AUDIT_LOCK:
+        with (base / AUDIT_FILE).open("ab") as fh:
+            fh.write(line)
 
 
 def append_feedback(scope: str, date: str, entry: Dict[str, Any]) -> None:
     base = Path("artifacts") / scope / date
     base.mkdir(parents=True, exist_ok=True)
-    trail_path = base / "audit_trail.json"
-    trail = []
-    if trail_path.exists():
-        trail = json.loads(trail_path.read_text())
-    trail.append(entry)
-    trail_path.write_text(json.dumps(trail, indent=2))
-
-    df_new = pd.DataFrame(
-        [
-            {
-                "decision": entry.get("decision"),
-                "reason": entry.get("reason"),
-                "modified": json.dumps(entry.get("modified")) if entry.get("modified") else None,
-                "action": json.dumps(entry.get("action")),
-            }
-        ]
-    )
-    fb_path = base / "feedback.parquet"
-    if fb_path.exists():
-        df_all = pd.read_parquet(fb_path)
-        df_all = pd.concat([df_all, df_new], ignore_index=True)
-    else:
-        df_all = df_new
-    df_all.to_parquet(fb_path, index=False)
+    append_audit_entry(base, entry)
 
+    append_feedback_row(
+        base,
+        {
+            "decision": entry.get("decision"),
+            "reason": entry.get("reason"),
+            "modified": json.dumps(entry.get("modified")) if entry.get("modified") else None,
+            "action": json.dumps(entry.get("action")),
+            **action_fields(entry.get("action")),
+        },
+    )
@@ -77,6 +77,7 @@ class FileDropAdapter(BaseAdapter):
     def __init__(self, path: str | Path, emit: Callable[[EventEnvelope], None]) -> None:
         super().__init__(source="file_drop", emit=emit)
         self.path = Path(path)
+        # Byte offset of the first unconsumed line; each tick reads only what was appended
         self.offset = 0
 
     def tick(self) -> None:
@@ -85,10 +86,20 @@ class FileDropAdapter(BaseAdapter):
                 return
             if not self.path.exists():
                 return
-            data = self.path.read_text(encoding="utf-8", errors="ignore")
-            lines = data.splitlines()
-            for i in range(self.offset, len(lines)):
-                line = lines[i].strip()
+            size = self.path.stat().st_size
+            if size < self.offset:
+                # File was truncated/rotated; start over (deduper drops replays)
+                self.offset = 0
+            if size == self.offset:
+                self.breaker.record_success()
+                return
+            with self.path.open("rb") as fh:
+                fh.seek(self.offset)
+                data = fh.read()
+            # Leave a trailing partial line for the next tick
+            end = data.rfind(b"\n") + 1
+            for raw in data[:end].splitlines():
+                line = raw.decode("utf-8", errors="ignore").strip()
                 if not line:
                     continue
                 try:
@@ -98,7 +109,7 @@ class FileDropAdapter(BaseAdapter):
                         self.emit(env)
                 except Exception:
                     continue
-            self.offset = len(lines)
+            self.offset += end
             self.breaker.record_success()
         except Exception:
             self.breaker.record_failure()
@@ -27,8 +27,9 @@ def _to_utc(s: pd.Series | None) -> pd.Series:
     return pd.to_datetime(s, utc=True, errors="coerce")
 
 
-def _pair_key(u: str, v: str) -> str:
-    return f"{u}__{v}"
+def _pair_key(u: pd.Series | str, v: pd.Series | str) -> pd.Series | str:
+    """``u__v`` edge key; works elementwise on string Series as well as scalars."""
+    return u + "__" + v
 
 
 def build_training_frame(scope: str, date: str) -> pd.DataFrame:
@@ -56,9 +57,9 @@ def build_training_frame(scope: str, date: str) -> pd.DataFrame:
     # Join edge attributes (u = station_id, v = next_station)
     if not edges.empty:
         edges_k = edges.copy()
-        edges_k["k"] = edges_k.apply(lambda r: _pair_key(str(r["u"]), str(r["v"])), axis=1)
+        edges_k["k"] = _pair_key(edges_k["u"].astype(str), edges_k["v"].astype(str))
         e_map = edges_k.set_index("k")[ ["min_run_time","headway","capacity"] ]
-        kser = df.apply(lambda r: _pair_key(str(r["station_id"]), str(r["next_station"])) if pd.notna(r["next_station"]) else None, axis=1)
+        kser = _pair_key(df["station_id"].astype(str), df["next_station"].astype(str)).where(df["next_station"].notna())
         df["min_run_time"] = kser.map(e_map["min_run_time"]) if "min_run_time" in e_map.columns else np.nan
         df["headway"] = kser.map(e_map["headway"]) if "headway" in e_map.columns else np.nan
         df["capacity"] = kser.map(e_map["capacity"]) if "capacity" in e_map.columns else 1
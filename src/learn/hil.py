@@ -52,8 +52,8 @@ def append_feedback(scope: str, date: str, action: Dict[str, Any], decision: str
     if rpick is None:
         return
 
-    # Build minimal state row via state_builder
-    df = build_examples(scope, date, persist=False, prefer_expert=False)
+    # Build minimal state row via state_builder (only this train's risks)
+    df = build_examples(scope, date, persist=False, prefer_expert=False, train_id=tid)
     row = None
     if not df.empty:
         sub = df[df["train_id"].astype(str) == tid]
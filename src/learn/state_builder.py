@@ -10,12 +10,17 @@ Outputs an in-memory DataFrame and optionally persists a parquet at:
   artifacts/<scope>/<date>/il_training.parquet
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-import json
 import pandas as pd
+import pyarrow.parquet as pq
+
+from src.data.cache import read_parquet_cached
+from src.data.serdes import loads_json
+from src.feedback.logger import feedback_actions, feedback_paths, load_feedback
 
 SEV_RANK = {"Critical": 0, "High": 1, "Medium": 2, "Low": 3}
 
@@ -37,6 +42,18 @@ _CLASS_PRIORITY = {  # higher number = higher priority cost to delay
 }
 
 
+@lru_cache(maxsize=8192)
+def _class_for_name(name: str) -> tuple[str, int]:
+    """Classify a train name into (class, priority); names repeat heavily across risks."""
+    nm = name.upper()
+    for kw, cls in _TRAIN_CLASS_KEYWORDS:
+        if kw in nm:
+            return cls, _CLASS_PRIORITY.get(cls, 1)
+    # default
+    cls = "Passenger"
+    return cls, _CLASS_PRIORITY.get(cls, 1)
+
+
 def _base(scope: str, date: str) -> Path:
     return Path("artifacts") / scope / date
 
@@ -63,11 +80,30 @@ def _read_json(p: Path) -> object | None:
     try:
         if not p.exists():
             return None
-        return json.loads(p.read_text())
+        return loads_json(p.read_bytes())
     except Exception:
         return None
 
 
+@lru_cache(maxsize=8)
+def _train_name_map(events_path: str, mtime_ns: int) -> Dict[str, str]:
+    """train_id -> train name from events_clean; cached per file version (``mtime_ns``)."""
+    names = set(pq.read_schema(events_path).names)
+    events = pd.read_parquet(events_path, columns=[c for c in ("train_id", "train_name", "Train Name", "name") if c in names])
+    name_map: Dict[str, str] = {}
+    if events.empty or "train_id" not in events.columns:
+        return name_map
+    name_col = None
+    for c in ("train_name", "Train Name", "name"):
+        if c in events.columns:
+            name_col = c
+            break
+    if name_col:
+        sub = events.dropna(subset=["train_id"]).drop_duplicates(subset=["train_id"]) [["train_id", name_col]]
+        name_map.update(zip(sub["train_id"].astype(str).tolist(), sub[name_col].astype(str).tolist()))
+    return name_map
+
+
 @dataclass
 class Row:
     # Minimal features (keep stable across versions)
@@ -91,7 +127,31 @@ class Row:
     station_id: str | None
 
 
-def build_examples(scope: str, date: str, *, persist: bool = True, prefer_expert: bool = True) -> pd.DataFrame:
+# Block occupancy columns used for density and upstream-station matching
+_BO_COLS = ["train_id", "block_id", "u", "v", "entry_time", "exit_time"]
+
+
+def _target_train(r: dict) -> str:
+    """Train a risk's hold applies to: the follower for headway risks, else the first."""
+    trains = [str(t) for t in (r.get("train_ids") or [])]
+    if str(r.get("type")) == "headway" and len(trains) >= 2:
+        return trains[1]
+    return trains[0] if trains else ""
+
+
+def build_examples(
+    scope: str,
+    date: str,
+    *,
+    persist: bool = True,
+    prefer_expert: bool = True,
+    train_id: Optional[str] = None,
+) -> pd.DataFrame:
+    """One example row per radar risk.
+
+    ``train_id`` restricts the build to risks targeting that train (a partial
+    table, never persisted) for callers that only need one train's rows.
+    """
     base = _base(scope, date)
     edges_p = base / "section_edges.parquet"
     nodes_p = base / "section_nodes.parquet"
@@ -107,44 +167,32 @@ def build_examples(scope: str, date: str, *, persist: bool = True, prefer_expert
         if not nodes_p.exists():
             nodes_p = base / "section_nodes.parquet"
 
-    edges = pd.read_parquet(edges_p) if edges_p.exists() else pd.DataFrame()
-    nodes = pd.read_parquet(nodes_p) if nodes_p.exists() else pd.DataFrame()
-    bo = pd.read_parquet(block_p) if block_p.exists() else pd.DataFrame()
+    # Cached per file version: the API and HIL logger call this on every suggestion/decision
+    edges = read_parquet_cached(edges_p) if edges_p.exists() else pd.DataFrame()
+    nodes = read_parquet_cached(nodes_p) if nodes_p.exists() else pd.DataFrame()
+    bo = read_parquet_cached(block_p, columns=_BO_COLS) if block_p.exists() else pd.DataFrame()
     radar = _read_json(radar_p) or []
+    if train_id is not None:
+        radar = [r for r in radar if _target_train(r) == str(train_id)]
+        persist = False
     waits_p = base / "national_waiting_ledger.parquet"
     if not waits_p.exists():
         waits_p = base / "waiting_ledger.parquet"
-    waits = pd.read_parquet(waits_p) if waits_p.exists() else pd.DataFrame()
+    waits = read_parquet_cached(waits_p, columns=["train_id"]) if waits_p.exists() else pd.DataFrame()
     events_p = base / "events_clean.parquet"
-    events = pd.read_parquet(events_p) if events_p.exists() else pd.DataFrame()
-    rec_plan = _read_json(base / "rec_plan.json") or []
+    # Expert targets (rec_plan + feedback) are only read when they are used
+    rec_plan = (_read_json(base / "rec_plan.json") or []) if prefer_expert else []
     # Build accepted action lookup from feedback (prefer APPLY/MODIFY/ACK)
     feedback_lookup: Dict[str, float] = {}
-    fb_pq = base / "feedback.parquet"
     try:
-        if fb_pq.exists():
-            fb = pd.read_parquet(fb_pq)
+        if prefer_expert and feedback_paths(base):
+            fb = load_feedback(base)
             if not fb.empty:
-                for _, r in fb.iterrows():
-                    dec = str(r.get("decision", "")).upper()
-                    if dec not in ("APPLY", "MODIFY", "ACK"):
-                        continue
-                    # action JSON contains minutes
-                    act = r.get("action")
-                    if isinstance(act, str):
-                        try:
-                            obj = json.loads(act)
-                        except Exception:
-                            obj = None
-                    elif isinstance(act, dict):
-                        obj = act
-                    else:
-                        obj = None
-                    if obj and obj.get("type") == "HOLD":
-                        key = (str(obj.get("train_id")), str(obj.get("block_id") or obj.get("station_id") or obj.get("at_station")))
-                        mins = obj.get("minutes")
-                        if mins is not None:
-                            feedback_lookup[str(key)] = float(mins)
+                acts = feedback_actions(fb)
+                dec = fb["decision"].astype(str).str.upper() if "decision" in fb.columns else pd.Series("", index=fb.index)
+                keep = dec.isin(["APPLY", "MODIFY", "ACK"]) & (acts["action_type"] == "HOLD") & acts["minutes"].notna()
+                for tid, loc, mins in acts.loc[keep, ["train_id", "loc", "minutes"]].itertuples(index=False):
+                    feedback_lookup[str((str(tid), str(loc)))] = float(mins)
     except Exception:
         pass
 
@@ -157,37 +205,33 @@ def build_examples(scope: str, date: str, *, persist: bool = True, prefer_expert
         bo["exit_time"] = _to_utc(bo.get("exit_time"))
 
     # Train name -> train class mapping
-    name_map: dict[str, str] = {}
-    if not events.empty and "train_id" in events.columns:
-        name_col = None
-        for c in ("train_name", "Train Name", "name"):
-            if c in events.columns:
-                name_col = c
-                break
-        if name_col:
-            sub = events.dropna(subset=["train_id"]).drop_duplicates(subset=["train_id"]) [["train_id", name_col]]
-            for _, rr in sub.iterrows():
-                name_map[str(rr["train_id"])]= str(rr[name_col])
+    name_map = _train_name_map(str(events_p), events_p.stat().st_mtime_ns) if events_p.exists() else {}
     # Heuristic classifier
     def _train_class(tid: str) -> tuple[str, int]:
-        nm = (name_map.get(str(tid)) or "").upper()
-        for kw, cls in _TRAIN_CLASS_KEYWORDS:
-            if kw in nm:
-                return cls, _CLASS_PRIORITY.get(cls, 1)
-        # default
-        cls = "Passenger"
-        return cls, _CLASS_PRIORITY.get(cls, 1)
+        return _class_for_name(name_map.get(str(tid)) or "")
 
     rows: List[Row] = []
 
+    # Per-block occupancy rows and per-train wait counts, built once for all risks
+    bo_by_block: Dict[object, pd.DataFrame] = {}
+    if not bo.empty and "block_id" in bo.columns:
+        risk_blocks = {str(r.get("block_id")) for r in radar if r.get("block_id")}
+        bo_risk = bo[bo["block_id"].isin(risk_blocks)]
+        bo_by_block = dict(tuple(bo_risk.groupby("block_id", sort=False)))
+    try:
+        wait_counts: Dict[str, int] = (
+            waits["train_id"].astype(str).value_counts().to_dict()
+            if not waits.empty and "train_id" in waits.columns
+            else {}
+        )
+    except Exception:
+        wait_counts = {}
+
     # Quick helper to count local density at risk start
     def _block_density(bid: str, start_ts: pd.Timestamp) -> int:
-        if bo.empty or bid not in set(bo.get("block_id", [])):
-            return 0
-        g = bo[bo["block_id"] == bid]
-        if g.empty:
+        g = bo_by_block.get(bid)
+        if g is None or g.empty:
             return 0
-        g = g.sort_values("entry_time")
         active = g[(g["entry_time"] <= start_ts) & (g["exit_time"] >= start_ts)]
         return int(len(active))
 
@@ -197,12 +241,8 @@ def build_examples(scope: str, date: str, *, persist: bool = True, prefer_expert
         lead = float(r.get("lead_min", 0.0))
         bid = r.get("block_id")
         sid = r.get("station_id")
-        trains = [str(t) for t in (r.get("train_ids") or [])]
         # choose target train: follower or first if unknown
-        if rtype == "headway" and len(trains) >= 2:
-            target_train = trains[1]
-        else:
-            target_train = trains[0] if trains else ""
+        target_train = _target_train(r)
         ts0 = None
         try:
             ts0 = pd.to_datetime(r.get("time_window")[0], utc=True) if r.get("time_window") else None
@@ -222,12 +262,7 @@ def build_examples(scope: str, date: str, *, persist: bool = True, prefer_expert
 
         # Priority & fairness features
         tr_class, prio_w = _train_class(target_train)
-        recent_holds = 0
-        try:
-            if not waits.empty and "train_id" in waits.columns:
-                recent_holds = int(waits[waits["train_id"].astype(str) == str(target_train)].shape[0])
-        except Exception:
-            recent_holds = 0
+        recent_holds = int(wait_counts.get(str(target_train), 0))
 
         # target minutes: prefer expert (rec_plan + feedback) if available
         need = float(r.get("required_hold_min", 2.0 if rtype == "block_capacity" else 0.0))
@@ -283,7 +318,8 @@ def build_examples(scope: str, date: str, *, persist: bool = True, prefer_expert
             )
         )
 
-    df = pd.DataFrame([r.__dict__ for r in rows])
+    # Column-wise build: one list per field instead of a dict per row
+    df = pd.DataFrame({f.name: [getattr(r, f.name) for r in rows] for f in fields(Row)})
     if persist:
         out_p = base / "il_training.parquet"
         df.to_parquet(out_p, index=False)
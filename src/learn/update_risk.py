@@ -2,27 +2,25 @@ from __future__ import annotations
 
 from pathlib import Path
 import json
-import pandas as pd
+
+from src.feedback.logger import feedback_actions, feedback_paths, load_feedback
 
 
 def main(scope: str, date: str) -> None:
     base = Path("artifacts") / scope / date
-    fb = base / "feedback.parquet"
-    if not fb.exists():
+    if not feedback_paths(base):
         (base / "risk_update_report.md").write_text("No feedback available.")
         return
-    df = pd.read_parquet(fb)
+    df = load_feedback(base)
     by_type = {}
-    for _, row in df.iterrows():
-        try:
-            action = json.loads(row["action"]) if isinstance(row["action"], str) else {}
-        except Exception:
-            action = {}
-        t = action.get("type", "UNKNOWN")
-        by_type.setdefault(t, {"APPLY": 0, "DISMISS": 0, "MODIFY": 0})
-        dec = str(row["decision"]).upper()
-        if dec in by_type[t]:
-            by_type[t][dec] += 1
+    if not df.empty:
+        types = feedback_actions(df)["action_type"]
+        # Upper-case all decisions at once, then count per (type, decision)
+        decs = df["decision"].astype(str).str.upper()
+        by_type = {t: {"APPLY": 0, "DISMISS": 0, "MODIFY": 0} for t in dict.fromkeys(types)}
+        for (t, dec), n in decs.groupby([types, decs], sort=False).size().items():
+            if dec in by_type[t]:
+                by_type[t][dec] = int(n)
     (base / "risk_update_report.md").write_text(json.dumps(by_type, indent=2))
 
 
@@ -81,14 +81,28 @@ def load_graph(nodes_df: pd.DataFrame, edges_df: pd.DataFrame) -> SectionGraph:
     nodes = _ensure_nodes(nodes_df)
     edges = _ensure_edges(edges_df)
 
-    block_attr = {
-        row["block_id"]: (float(row["min_run_time"]), float(row["headway"]), int(row["capacity"]))
-        for _, row in edges.iterrows()
-    }
-    pair_to_block = {(row["u"], row["v"]): row["block_id"] for _, row in edges.iterrows()}
-    station_attr = {
-        row["station_id"]: (int(row["platforms"]), float(row["min_dwell_min"]), float(row.get("route_setup_min", 0.5)))
-        for _, row in nodes.iterrows()
-    }
+    # Lookups built from column lists (dtypes are normalised by _ensure_*)
+    block_ids = edges["block_id"].tolist()
+    block_attr = dict(
+        zip(
+            block_ids,
+            zip(
+                edges["min_run_time"].astype(float).tolist(),
+                edges["headway"].astype(float).tolist(),
+                edges["capacity"].astype(int).tolist(),
+            ),
+        )
+    )
+    pair_to_block = dict(zip(zip(edges["u"].tolist(), edges["v"].tolist()), block_ids))
+    station_attr = dict(
+        zip(
+            nodes["station_id"].tolist(),
+            zip(
+                nodes["platforms"].astype(int).tolist(),
+                nodes["min_dwell_min"].astype(float).tolist(),
+                nodes["route_setup_min"].astype(float).tolist(),
+            ),
+        )
+    )
 
     return SectionGraph(nodes=nodes, edges=edges, block_attr=block_attr, pair_to_block=pair_to_block, station_attr=station_attr)
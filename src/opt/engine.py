@@ -405,7 +405,13 @@ def save(
     from pathlib import Path
     p = Path(out_dir)
     p.mkdir(parents=True, exist_ok=True)
+    from src.data.cache import write_twin
+
     (p / "rec_plan.json").write_text(json.dumps(rec_plan, indent=2))
-    (p / "alt_options.json").write_text(json.dumps(alt_options, indent=2))
+    write_twin(rec_plan, p / "rec_plan.json")
+    # Alternatives repeat their full ``risk_ref`` per option; hoist repeats
+    from src.data.serdes import dumps_dedup
+
+    (p / "alt_options.json").write_text(dumps_dedup(alt_options, indent=2))
     (p / "plan_metrics.json").write_text(json.dumps(plan_metrics, indent=2))
     (p / "audit_log.json").write_text(json.dumps(audit_log, indent=2))
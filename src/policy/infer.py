@@ -6,14 +6,19 @@ Prefers HOLD actions for first deployment phases. Falls back to
 heuristic optimizer if model is missing.
 """
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import json
 import math
 
 import joblib  # type: ignore
+import numpy as np
 import pandas as pd
 
+from src.data.cache import read_parquet_cached
+from src.data.serdes import loads_json
+from src.feedback.logger import load_audit_trail
 from src.learn.state_builder import build_examples, feature_label, SEV_RANK
 
 
@@ -25,11 +30,21 @@ def _read_json(p: Path) -> object | None:
     try:
         if not p.exists():
             return None
-        return json.loads(p.read_text())
+        return loads_json(p.read_bytes())
     except Exception:
         return None
 
 
+@lru_cache(maxsize=4)
+def _load_payload_cached(path: str, mtime_ns: int) -> dict:
+    return joblib.load(path)
+
+
+def _load_payload(p: Path) -> dict:
+    """Model payload from ``p``, deserialized once per file version and then reused."""
+    return _load_payload_cached(str(p), p.stat().st_mtime_ns)
+
+
 def _to_utc(s: pd.Series | None) -> pd.Series:
     if s is None:
         return pd.Series(dtype="datetime64[ns, UTC]")
@@ -56,8 +71,7 @@ def _safety_adjust_minutes(
     if block_occ_df.empty or edges_df.empty:
         return max(0.0, min(float(minutes), float(max_hold_min)))
     try:
-        g = block_occ_df.copy()
-        g = g[g["block_id"].astype(str) == str(bid)]
+        g = block_occ_df[block_occ_df["block_id"].astype(str) == str(bid)]
         if g.empty:
             return max(0.0, min(float(minutes), float(max_hold_min)))
         g = g.sort_values("entry_time")
@@ -128,13 +142,13 @@ def suggest(
     block_p = base / "national_block_occupancy.parquet"
     nodes_p = base / "section_nodes.parquet"
 
-    edges = pd.read_parquet(edges_p) if edges_p.exists() else pd.DataFrame()
-    nodes = pd.read_parquet(nodes_p) if nodes_p.exists() else pd.DataFrame()
-    bo = pd.read_parquet(block_p) if block_p.exists() else pd.DataFrame()
+    edges = read_parquet_cached(edges_p) if edges_p.exists() else pd.DataFrame()
+    nodes = read_parquet_cached(nodes_p) if nodes_p.exists() else pd.DataFrame()
+    bo = read_parquet_cached(block_p) if block_p.exists() else pd.DataFrame()
     radar = _read_json(radar_p) or []
 
     if bo is not None and not bo.empty:
-        bo = bo.copy()
+        # read_parquet_cached already hands back a private frame
         bo["entry_time"] = _to_utc(bo.get("entry_time"))
         bo["exit_time"] = _to_utc(bo.get("exit_time"))
 
@@ -183,21 +197,20 @@ def suggest(
 
     pred_cls = None
     if model_path_kind == "rl":
-        payload = joblib.load(model_p)
+        payload = _load_payload(model_p)
         model = payload.get("model")
         features = payload.get("features") or []
         actions = payload.get("actions") or [2, 3, 5]
-        X_base = df[features].copy()
+        X_base = df[features]
         pred_cls = []
-        for _, row in X_base.iterrows():
-            q_vals = []
-            for a in actions:
-                vec = row.to_dict()
-                for aa in actions:
-                    vec[f"a_{aa}"] = 1.0 if aa == a else 0.0
-                q = float(model.predict(pd.DataFrame([vec]))[0])
-                q_vals.append((a, q))
-            pred_cls.append(int(max(q_vals, key=lambda t: t[1])[0]))
+        if len(X_base):
+            # One batched predict per action instead of a one-row frame per (row, action)
+            q = np.column_stack([
+                np.asarray(model.predict(X_base.assign(**{f"a_{aa}": 1.0 if aa == a else 0.0 for aa in actions})), dtype=float)
+                for a in actions
+            ])
+            # argmax keeps the first action on ties, as max() over the list did
+            pred_cls = [int(actions[i]) for i in q.argmax(axis=1)]
     elif model_path_kind == "torch":
         try:
             import torch  # type: ignore
@@ -246,7 +259,7 @@ def suggest(
             pred_cls = [int(classes[i]) for i in idx]
     if pred_cls is None:
         # Fallback to IL
-        payload = joblib.load(model_p)
+        payload = _load_payload(model_p)
         model = payload.get("model")
         features = payload.get("features") or []
         X_base = df[features].copy() if features else df.drop(columns=["hold_class"], errors="ignore")
@@ -314,7 +327,7 @@ def suggest(
             rate_p = base / "rate_limit.json"
             now = pd.Timestamp.utcnow().tz_localize("UTC")
             if rate_p.exists():
-                rate_meta = json.loads(rate_p.read_text())
+                rate_meta = loads_json(rate_p.read_bytes())
             key = f"{station_id}"
             times = [pd.to_datetime(t) for t in rate_meta.get(key, [])]
             times = [t for t in times if (now - t).total_seconds() < 60]
@@ -325,7 +338,7 @@ def suggest(
             rate_meta[key] = [str(t) for t in times]
             rate_p.write_text(json.dumps(rate_meta, indent=2))
             # Cooldown: if last DISMISS in past 5 minutes for this station, suppress
-            audit = _read_json(base / "audit_trail.json") or []
+            audit = load_audit_trail(base)
             last_dismiss = None
             for e in reversed(audit):
                 if str(e.get("decision","")) == "DISMISS":
@@ -3,11 +3,18 @@ from __future__ import annotations
 from pathlib import Path
 import json
 import pandas as pd
+import pyarrow.parquet as pq
 import numpy as np
 
+from src.data.cache import read_twin_cached
+from src.data.serdes import loads_json
+from src.feedback.logger import feedback_actions, feedback_paths, load_audit_trail, load_feedback
+
+_DECISIONS = frozenset({"APPLY", "DISMISS", "MODIFY", "ACK"})
+
 
 def _read_json(p: Path):
-    return json.loads(p.read_text()) if p.exists() else None
+    return loads_json(p.read_bytes()) if p.exists() else None
 
 
 def main(scope: str, date: str) -> None:
@@ -18,8 +25,6 @@ def main(scope: str, date: str) -> None:
     plan_apply = base / "plan_apply_report.json"
     risk_val = base / "risk_validation.json"
     rec_path = base / "rec_plan.json"
-    trail_path = base / "audit_trail.json"
-    fb_path = base / "feedback.parquet"
     block_p = base / "national_block_occupancy.parquet"
     plat_p = base / "national_platform_occupancy.parquet"
     waits_p = base / "national_waiting_ledger.parquet"
@@ -40,10 +45,12 @@ def main(scope: str, date: str) -> None:
         out["risk_validation"] = _read_json(risk_val)
 
     # Feedback completeness
-    rec = _read_json(rec_path) or []
-    trail = _read_json(trail_path) or []
-    acted = len([e for e in trail if str(e.get("decision")).upper() in ("APPLY", "DISMISS", "MODIFY", "ACK")])
-    total = len(rec)
+    # Only the plan size is needed; the parquet twin answers it without parsing the JSON
+    rec_twin = read_twin_cached(rec_path, columns=["type"])
+    n_rec = len(rec_twin) if rec_twin is not None else len(_read_json(rec_path) or [])
+    trail = load_audit_trail(base)
+    acted = sum(1 for e in trail if str(e.get("decision")).upper() in _DECISIONS)
+    total = n_rec
     out["feedback_completeness"] = {
         "recommendations": total,
         "decisions_logged": acted,
@@ -52,22 +59,17 @@ def main(scope: str, date: str) -> None:
 
     # Override insights (counts by action type and decision)
     override = {}
-    if fb_path.exists():
-        df = pd.read_parquet(fb_path)
-        def _type_of(row):
-            try:
-                a = json.loads(row["action"]) if isinstance(row["action"], str) else {}
-                return a.get("type", "UNKNOWN")
-            except Exception:
-                return "UNKNOWN"
-        if not df.empty:
-            df = df.copy()
-            df["action_type"] = df.apply(_type_of, axis=1)
-            grp = df.groupby(["action_type", "decision"]).size().reset_index(name="count")
-            for _, r in grp.iterrows():
-                t = str(r["action_type"])  # type: ignore
-                d = str(r["decision"])  # type: ignore
-                override.setdefault(t, {})[d] = int(r["count"])  # type: ignore
+    # Feedback is read once and shared by the override, action-rate and workload KPIs
+    fb = load_feedback(base) if feedback_paths(base) else pd.DataFrame()
+    # Upper-cased decisions, shared by the action-rate and workload KPIs
+    decs = fb["decision"].astype(str).str.upper() if "decision" in fb.columns else None
+    if not fb.empty:
+        df = fb.assign(action_type=feedback_actions(fb)["action_type"])
+        grp = df.groupby(["action_type", "decision"]).size().reset_index(name="count")
+        for _, r in grp.iterrows():
+            t = str(r["action_type"])  # type: ignore
+            d = str(r["decision"])  # type: ignore
+            override.setdefault(t, {})[d] = int(r["count"])  # type: ignore
     out["override_insights"] = override
 
     # Primary KPIs
@@ -75,17 +77,15 @@ def main(scope: str, date: str) -> None:
     # Throughput: blocks cleared/hour and trains/hour
     try:
         if block_p.exists():
-            bo = pd.read_parquet(block_p)
+            bo = pd.read_parquet(block_p, columns=["exit_time"])
             if not bo.empty:
-                bo = bo.copy()
                 bo["exit_time"] = pd.to_datetime(bo["exit_time"], utc=True)
                 per_h = bo.set_index("exit_time").resample("1H").size()
                 prim["blocks_cleared_per_hour_mean"] = float(per_h.mean())
                 prim["blocks_cleared_per_hour_peak"] = float(per_h.max())
         if plat_p.exists():
-            po = pd.read_parquet(plat_p)
+            po = pd.read_parquet(plat_p, columns=["train_id", "dep_platform"])
             if not po.empty:
-                po = po.copy()
                 po["dep_platform"] = pd.to_datetime(po["dep_platform"], utc=True)
                 last = po.sort_values(["train_id", "dep_platform"]).groupby("train_id").tail(1)
                 per_h_t = last.set_index("dep_platform").resample("1H").size()
@@ -110,13 +110,10 @@ def main(scope: str, date: str) -> None:
         pass
     # Action rate from feedback
     try:
-        rec = _read_json(rec_path) or []
-        total_rec = len(rec)
+        total_rec = n_rec
         accepted = 0
-        if fb_path.exists():
-            df = pd.read_parquet(fb_path)
-            if not df.empty and "decision" in df.columns:
-                accepted = int((df["decision"].str.upper() == "APPLY").sum())
+        if decs is not None:
+            accepted = int(decs.eq("APPLY").sum())
         prim["action_rate_apply_pct"] = float((accepted / total_rec * 100.0) if total_rec else 0.0)
         prim["actions_total"] = total_rec
         prim["actions_accepted"] = accepted
@@ -144,26 +141,24 @@ def main(scope: str, date: str) -> None:
         mapping: dict[str, str] = {}
         if name_col:
             sub = df_events.dropna(subset=["train_id"]).drop_duplicates(subset=["train_id"]) [["train_id", name_col]]
-            for _, r in sub.iterrows():
-                nm = str(r[name_col]).upper()
-                cls = "Passenger"
-                if "SUPERFAST" in nm:
-                    cls = "Superfast"
-                elif "EXPRESS" in nm:
-                    cls = "Express"
-                elif "EMU" in nm or "LOCAL" in nm:
-                    cls = "EMU"
-                elif "GOODS" in nm or "FREIGHT" in nm:
-                    cls = "Freight"
-                mapping[str(r["train_id"])]= cls
+            nm = sub[name_col].astype(str).str.upper()
+            has = lambda kw: nm.str.contains(kw, regex=False)
+            cls = np.select(
+                [has("SUPERFAST"), has("EXPRESS"), has("EMU") | has("LOCAL"), has("GOODS") | has("FREIGHT")],
+                ["Superfast", "Express", "EMU", "Freight"],
+                default="Passenger",
+            )
+            mapping.update(zip(sub["train_id"].astype(str).tolist(), cls.tolist()))
         return mapping
     try:
         if waits_p.exists() and events_p.exists():
-            wl = pd.read_parquet(waits_p)
-            ev = pd.read_parquet(events_p)
+            wl = pd.read_parquet(waits_p, columns=["train_id", "minutes"])
+            # Only train ids and (if present) a name column feed the class map
+            ev_names = set(pq.read_schema(events_p).names)
+            ev = pd.read_parquet(events_p, columns=[c for c in ("train_id", "train_name", "Train Name", "name") if c in ev_names])
             if not wl.empty and not ev.empty and "train_id" in wl.columns:
                 cls_map = _train_class_map(ev)
-                wl["cls"] = wl["train_id"].astype(str).map(lambda x: cls_map.get(x, "Passenger"))
+                wl["cls"] = wl["train_id"].astype(str).map(cls_map).fillna("Passenger")
                 by = wl.groupby("cls")["minutes"].mean().to_dict()
                 # simple fairness KPI: ratio of mean hold in class vs overall mean
                 overall = float(pd.to_numeric(wl["minutes"], errors="coerce").mean())
@@ -182,17 +177,14 @@ def main(scope: str, date: str) -> None:
         if isinstance(aud, dict) and "runtime_sec" in aud:
             ops["opt_runtime_sec"] = float(aud.get("runtime_sec", 0.0))
         # Controller workload from feedback per hour
-        if fb_path.exists():
-            df = pd.read_parquet(fb_path)
-            if not df.empty and "ts" in df.columns:
-                df = df.copy()
-                ts = pd.to_datetime(df["ts"], errors="coerce")
-                per_h = ts.dt.floor("H").value_counts().sort_index()
-                ops["decisions_per_hour"] = {str(k): int(v) for k, v in per_h.to_dict().items()}
-                decs = df["decision"].str.upper()
-                tot = int(len(decs))
-                ops["dismiss_apply_ratio"] = float((decs.eq("DISMISS").sum() / decs.eq("APPLY").sum()) if decs.eq("APPLY").sum() else 0.0)
-                ops["decisions_total"] = tot
+        if not fb.empty and "ts" in fb.columns:
+            ts = pd.to_datetime(fb["ts"], errors="coerce")
+            per_h = ts.dt.floor("H").value_counts().sort_index()
+            ops["decisions_per_hour"] = {str(k): int(v) for k, v in per_h.to_dict().items()}
+            if decs is not None:
+                n_apply = decs.eq("APPLY").sum()
+                ops["dismiss_apply_ratio"] = float((decs.eq("DISMISS").sum() / n_apply) if n_apply else 0.0)
+                ops["decisions_total"] = int(len(decs))
     except Exception:
         pass
     out["ops_kpis"] = ops
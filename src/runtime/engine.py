@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import json
 import time
 import threading
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Callable
 
 import pandas as pd
@@ -39,6 +41,7 @@ class RuntimeEngine:
         self.state = EngineState()
         self._stop = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        self._last_inputs: Optional[tuple] = None
         self.adapters: List[Callable[[], None]] = []
         # Build adapters (file_drop under artifacts/<scope>/<date>/events_live.jsonl)
         from pathlib import Path
@@ -99,6 +102,16 @@ class RuntimeEngine:
         nodes_p = base / "section_nodes.parquet"
         if not (edges_p.exists() and nodes_p.exists() and block.exists()):
             return
+        # Risk analysis and the optimizer are deterministic in their inputs; skip the
+        # cycle when no artifact changed since the last successful recompute.
+        key = (
+            tuple(_file_stamp(p) for p in (edges_p, nodes_p, block, plat)),
+            self.cfg.horizon_min,
+            self.cfg.max_hold_min,
+            self.cfg.max_holds_per_train,
+        )
+        if key == self._last_inputs:
+            return
         edges = pd.read_parquet(edges_p)
         nodes = pd.read_parquet(nodes_p)
         bo = pd.read_parquet(block)
@@ -107,27 +120,28 @@ class RuntimeEngine:
         # Snapshot (compact): last known presence per train
         try:
             if not bo.empty:
-                last = bo.sort_values("exit_time").groupby("train_id").tail(1)
+                last = (
+                    bo.dropna(subset=["train_id"])
+                    .sort_values("exit_time")
+                    .drop_duplicates("train_id", keep="last")
+                )
+                cols = {c: [str(x) for x in last[c].tolist()] for c in ("train_id", "block_id", "u", "v")}
                 snap = [
-                    {
-                        "train_id": str(r.train_id),
-                        "block_id": str(r.block_id),
-                        "u": str(r.u),
-                        "v": str(r.v),
-                        "progress_pct": 100.0,
-                    }
-                    for _, r in last.iterrows()
+                    {"train_id": t, "block_id": b, "u": u, "v": v, "progress_pct": 100.0}
+                    for t, b, u, v in zip(cols["train_id"], cols["block_id"], cols["u"], cols["v"])
                 ]
                 self.state.twin_snapshot = snap
         except Exception:
             self.state.twin_snapshot = []
 
         # Risks
+        ok = True
         try:
             risks, _, _, _ = risk_analyze(edges, nodes, bo, platform_occ_df=plat_df, t0=None, horizon_min=self.cfg.horizon_min)
             self.state.last_risks = risks
         except Exception:
             self.state.last_risks = []
+            ok = False
 
         # Optimization (heuristic) with basic hysteresis
         try:
@@ -142,4 +156,17 @@ class RuntimeEngine:
             self.state.last_plan = rec
         except Exception:
             self.state.last_plan = []
+            ok = False
+        # Only a fully successful cycle may be skipped next time; after a
+        # failure the same inputs are retried on the next tick
+        if ok:
+            self._last_inputs = key
+
+
+def _file_stamp(p: Path) -> tuple:
+    try:
+        st = p.stat()
+        return (str(p), st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (str(p), None, None)
 
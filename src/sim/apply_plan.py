@@ -7,6 +7,7 @@ baseline within a given horizon.
 
 from __future__ import annotations
 
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import json
@@ -178,11 +179,7 @@ def apply_and_validate(
 
     # Risk breakdowns by type
     def _breakdown(rs: List[dict]) -> Dict[str, int]:
-        out: Dict[str, int] = {}
-        for r in rs:
-            t = str(r.get("type"))
-            out[t] = out.get(t, 0) + 1
-        return out
+        return dict(Counter(str(r.get("type")) for r in rs))
     breakdown_before = _breakdown(risks_before)
     breakdown_after = _breakdown(risks_after)
 
@@ -10,7 +10,8 @@ Inputs:
 
 Outputs:
 - block_occupancy: per train x block entry/exit with holds applied.
-- platform_occupancy: per train x station dwell windows.
+- platform_occupancy: per train x station dwell windows (saved with a
+  ``station_label`` column joined from the station map).
 - waiting_ledger: holds with reason (block/headway/platform) and durations.
 - sim_kpis: OTP%, avg/p90 delays at last station; trains_served; total wait minutes by reason.
 
@@ -289,13 +290,32 @@ def run(
     return SimResult(df_blocks, df_plats, df_waits, kpi)
 
 
+def _with_station_label(df_plats: pd.DataFrame) -> pd.DataFrame:
+    """Platform occupancy plus ``station_label`` (station name, else the id).
+
+    Names come from the station map written by ``src.data.normalize``; the
+    join is done once here so readers do not relabel on every render.
+    """
+    if df_plats.empty or "station_id" not in df_plats.columns:
+        return df_plats
+    from pathlib import Path
+
+    ids = df_plats["station_id"].astype(str)
+    try:
+        smap = pd.read_csv(Path(__file__).resolve().parents[1] / "data" / "station_map.csv", dtype=str)
+        names = dict(zip(smap["station_id"], smap["name"]))
+    except Exception:
+        names = {}
+    return df_plats.assign(station_label=ids.map(names).fillna(ids))
+
+
 def save(result: SimResult, out_dir: str | "PathLike[str]") -> None:
     from pathlib import Path
 
     out = Path(out_dir)
     out.mkdir(parents=True, exist_ok=True)
     result.block_occupancy.to_parquet(out / "national_block_occupancy.parquet", index=False)
-    result.platform_occupancy.to_parquet(out / "national_platform_occupancy.parquet", index=False)
+    _with_station_label(result.platform_occupancy).to_parquet(out / "national_platform_occupancy.parquet", index=False)
     result.waiting_ledger.to_parquet(out / "national_waiting_ledger.parquet", index=False)
     import json
     (out / "national_sim_kpis.json").write_text(json.dumps(result.sim_kpis, indent=2))
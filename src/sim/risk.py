@@ -25,6 +25,7 @@ Outputs
 
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
 from typing import Dict, List, Tuple, Optional
 
@@ -32,7 +33,7 @@ import json
 import math
 import pandas as pd
 
-__all__ = ["analyze", "validate", "save"]
+__all__ = ["analyze", "validate", "aggregate", "save"]
 
 
 def _to_utc(s: pd.Series | None) -> pd.Series:
@@ -68,19 +69,24 @@ def analyze(
     bucket_min: int = 5,
 ) -> tuple[list[dict], pd.DataFrame, list[dict], dict]:
     # Normalize inputs
-    edges = edges_df.copy()
-    edges["headway"] = pd.to_numeric(edges.get("headway", 0), errors="coerce").fillna(0.0)
-    edges["capacity"] = pd.to_numeric(edges.get("capacity", 1), errors="coerce").fillna(1).astype(int)
-    nodes = nodes_df.copy()
-    nodes["platforms"] = pd.to_numeric(nodes.get("platforms", 1), errors="coerce").fillna(1).astype(int)
-
-    bo = block_occ_df.copy()
-    if bo.empty:
+    # ``assign`` instead of copy-then-set: inputs are never mutated, and untouched
+    # columns are not duplicated
+    edges = edges_df.assign(
+        headway=pd.to_numeric(edges_df.get("headway", 0), errors="coerce").fillna(0.0),
+        capacity=pd.to_numeric(edges_df.get("capacity", 1), errors="coerce").fillna(1).astype(int),
+    )
+    nodes = nodes_df.assign(
+        platforms=pd.to_numeric(nodes_df.get("platforms", 1), errors="coerce").fillna(1).astype(int)
+    )
+
+    if block_occ_df.empty:
         return [], pd.DataFrame(columns=["ts_bucket","resource_type","resource_id","risk_count"]), [], {"total_risks": 0}
 
-    bo["entry_time"] = _to_utc(bo["entry_time"])
-    bo["exit_time"] = _to_utc(bo["exit_time"])
-    bo["headway_applied_min"] = pd.to_numeric(bo.get("headway_applied_min", 0.0), errors="coerce").fillna(0.0)
+    bo = block_occ_df.assign(
+        entry_time=_to_utc(block_occ_df["entry_time"]),
+        exit_time=_to_utc(block_occ_df["exit_time"]),
+        headway_applied_min=pd.to_numeric(block_occ_df.get("headway_applied_min", 0.0), errors="coerce").fillna(0.0),
+    )
 
     # Join edge attributes
     bo = bo.merge(edges[["block_id","headway","capacity"]], on="block_id", how="left")
@@ -153,9 +159,10 @@ def analyze(
 
     # Platform risks: derive from waiting ledger or platform occupancy if available
     if waiting_df is not None and not getattr(waiting_df, "empty", True):
-        wd = waiting_df.copy()
-        wd["start_time"] = _to_utc(wd["start_time"]) if "start_time" in wd.columns else pd.NaT
-        wd["end_time"] = _to_utc(wd["end_time"]) if "end_time" in wd.columns else pd.NaT
+        wd = waiting_df.assign(
+            start_time=_to_utc(waiting_df["start_time"]) if "start_time" in waiting_df.columns else pd.NaT,
+            end_time=_to_utc(waiting_df["end_time"]) if "end_time" in waiting_df.columns else pd.NaT,
+        )
         wd = wd[(wd["reason"] == "platform_busy") & wd["start_time"].notna()]
         wd = wd[(wd["start_time"] >= t0) & (wd["start_time"] <= t1)]
         for _, row in wd.iterrows():
@@ -171,9 +178,10 @@ def analyze(
             })
     elif platform_occ_df is not None and not platform_occ_df.empty:
         # Detect overflows from provided platform occupancy
-        po = platform_occ_df.copy()
-        po["arr_platform"] = _to_utc(po["arr_platform"]) if "arr_platform" in po.columns else pd.NaT
-        po["dep_platform"] = _to_utc(po["dep_platform"]) if "dep_platform" in po.columns else pd.NaT
+        po = platform_occ_df.assign(
+            arr_platform=_to_utc(platform_occ_df["arr_platform"]) if "arr_platform" in platform_occ_df.columns else pd.NaT,
+            dep_platform=_to_utc(platform_occ_df["dep_platform"]) if "dep_platform" in platform_occ_df.columns else pd.NaT,
+        )
         po = po[(po["arr_platform"] >= t0) & (po["arr_platform"] <= t1)]
         plat_map = nodes.set_index("station_id")["platforms"].to_dict()
         for sid, grp in po.groupby("station_id"):
@@ -204,7 +212,9 @@ def analyze(
         else:
             dwell_map = pd.to_numeric(dwell_map, errors="coerce").fillna(2.0)
         arrivals = bo[["train_id", "v", "exit_time"]].rename(columns={"v": "station_id", "exit_time": "arr_platform"})
-        arrivals["dep_platform"] = arrivals.apply(lambda r: r["arr_platform"] + pd.Timedelta(minutes=float(dwell_map.get(r["station_id"], 2.0))), axis=1)
+        dwell_map = dwell_map[~dwell_map.index.duplicated()]
+        dwell = pd.to_numeric(arrivals["station_id"].map(dwell_map), errors="coerce").fillna(2.0).astype(float)
+        arrivals["dep_platform"] = arrivals["arr_platform"] + pd.to_timedelta(dwell, unit="m")
         po = arrivals[(arrivals["arr_platform"] >= t0) & (arrivals["arr_platform"] <= t1)]
         plat_map = nodes.set_index("station_id")["platforms"].to_dict()
         for sid, grp in po.groupby("station_id"):
@@ -246,13 +256,15 @@ def analyze(
     previews: List[dict] = []
     # Precompute per-train downstream chains to approximate ETA deltas
     bo_sorted = bo.sort_values("entry_time")
-    by_train: Dict[str, pd.DataFrame] = {tid: g.copy() for tid, g in bo_sorted.groupby("train_id")}
+    # Row positions per train; only the trains named by a risk are ever sliced out
+    train_pos = bo_sorted.groupby("train_id").indices
 
     def _eta_delta(train_id: str, hold_min: float, start_ts: pd.Timestamp) -> float:
-        g = by_train.get(train_id)
-        if g is None or g.empty:
+        pos = train_pos.get(train_id)
+        if pos is None or len(pos) == 0:
             return 0.0
-        g = g.sort_values("entry_time").copy()
+        train_rows = bo_sorted.iloc[pos]
+        g = train_rows.sort_values("entry_time")
         # cumulative shift applied to segments at/after start_ts
         shift = 0.0
         last_exit = None
@@ -269,7 +281,7 @@ def analyze(
         if last_exit is None:
             return 0.0
         # Compare to original last exit
-        base_last = by_train[train_id]["exit_time"].max()
+        base_last = train_rows["exit_time"].max()
         return max(0.0, (last_exit - base_last).total_seconds() / 60.0)
     for i, r in enumerate(risks):
         suggestion = None
@@ -331,12 +343,13 @@ def analyze(
             previews.append(suggestion)
 
     # KPIs
+    sev_counts = Counter(r["severity"] for r in risks)
     kpis: Dict[str, float] = {
         "total_risks": float(len(risks)),
-        "critical": float(sum(1 for r in risks if r["severity"] == "Critical")),
-        "high": float(sum(1 for r in risks if r["severity"] == "High")),
-        "medium": float(sum(1 for r in risks if r["severity"] == "Medium")),
-        "low": float(sum(1 for r in risks if r["severity"] == "Low")),
+        "critical": float(sev_counts["Critical"]),
+        "high": float(sev_counts["High"]),
+        "medium": float(sev_counts["Medium"]),
+        "low": float(sev_counts["Low"]),
     }
     if risks:
         kpis["avg_lead_min"] = float(pd.Series([r["lead_min"] for r in risks]).mean())
@@ -354,11 +367,12 @@ def validate(
     risks: List[dict],
 ) -> Dict[str, object]:
     # Overlaps in post-enforcement occupancy beyond capacity
-    edges = edges_df[["block_id", "headway", "capacity"]].copy()
-    edges["capacity"] = pd.to_numeric(edges.get("capacity", 1), errors="coerce").fillna(1).astype(int)
-    bo = block_occ_df.copy()
-    bo["entry_time"] = _to_utc(bo["entry_time"]) if "entry_time" in bo.columns else pd.NaT
-    bo["exit_time"] = _to_utc(bo["exit_time"]) if "exit_time" in bo.columns else pd.NaT
+    edges = edges_df[["block_id", "headway", "capacity"]]
+    edges = edges.assign(capacity=pd.to_numeric(edges.get("capacity", 1), errors="coerce").fillna(1).astype(int))
+    bo = block_occ_df.assign(
+        entry_time=_to_utc(block_occ_df["entry_time"]) if "entry_time" in block_occ_df.columns else pd.NaT,
+        exit_time=_to_utc(block_occ_df["exit_time"]) if "exit_time" in block_occ_df.columns else pd.NaT,
+    )
     bo = bo.merge(edges, on="block_id", how="left")
     post_overlap = 0
     headway_viol = 0
@@ -394,6 +408,41 @@ def validate(
     }
 
 
+# Lead-time ranges (minutes) for the radar heatmap; the last is open-ended.
+# Distinct from the coarser per-record ``lead_bucket`` ("<=5" .. ">15").
+LEAD_RANGES = [0, 5, 10, 20, 30, 45, 60, 90]
+LEAD_RANGE_LABELS = [
+    f"{b}+" if i == len(LEAD_RANGES) - 1 else f"{b}-{LEAD_RANGES[i + 1]}"
+    for i, b in enumerate(LEAD_RANGES)
+]
+
+
+def aggregate(risks: List[dict]) -> pd.DataFrame:
+    """Count risks per ``(lead_range, type, severity)``.
+
+    Bucketed as the dashboard heatmap does: a missing lead (None/NaN, which
+    reaches the client as null) counts as 0, and leads that are unparsable or
+    outside ``[0, 90)`` fall in the open-ended last range.
+    """
+    cols = ["lead_range", "type", "severity", "count"]
+    if not risks:
+        return pd.DataFrame(columns=cols)
+
+    def _lead(v: object) -> object:
+        return 0 if v is None or v != v else v
+
+    df = pd.DataFrame(
+        {
+            "lead_min": pd.to_numeric(pd.Series([_lead(r.get("lead_min")) for r in risks], dtype=object), errors="coerce"),
+            "type": [str(r.get("type") or "unknown") for r in risks],
+            "severity": [str(r.get("severity") or "Unknown") for r in risks],
+        }
+    )
+    idx = pd.cut(df["lead_min"], bins=LEAD_RANGES, right=False, labels=False)
+    df["lead_range"] = [LEAD_RANGE_LABELS[int(i)] if i == i else LEAD_RANGE_LABELS[-1] for i in idx]
+    return df.groupby(["lead_range", "type", "severity"], sort=True).size().reset_index(name="count")[cols]
+
+
 def save(
     risks: List[dict],
     timeline: pd.DataFrame,
@@ -405,7 +454,11 @@ def save(
     from pathlib import Path
     out = Path(out_dir)
     out.mkdir(parents=True, exist_ok=True)
+    from src.data.cache import write_twin
+
     (out / "conflict_radar.json").write_text(json.dumps(risks, indent=2))
+    write_twin(risks, out / "conflict_radar.json")
+    aggregate(risks).to_parquet(out / "conflict_radar_agg.parquet", index=False)
     timeline.to_parquet(out / "risk_timeline.parquet", index=False)
     (out / "mitigation_preview.json").write_text(json.dumps(previews, indent=2))
     (out / "risk_kpis.json").write_text(json.dumps(kpis, indent=2))
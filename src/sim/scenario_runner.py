@@ -14,6 +14,7 @@ from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from src.data.cache import read_parquet_cached
 from src.model.section_graph import load_graph
 from src.sim.national_replay import run as replay_run
 from src.sim.risk import analyze as risk_analyze
@@ -65,9 +66,10 @@ def apply_template(events: pd.DataFrame, nodes: pd.DataFrame, edges: pd.DataFram
 def run_one(scope: str, date: str, spec: ScenarioSpec, *, horizon_min: int = 60) -> Dict[str, object]:
     from pathlib import Path
     base = Path("artifacts") / scope / date
-    events = pd.read_parquet(base / "events_clean.parquet")
-    nodes = pd.read_parquet(base / "section_nodes.parquet")
-    edges = pd.read_parquet(base / "section_edges.parquet")
+    # Cached reads hand back private copies, so templates may mutate them freely
+    events = read_parquet_cached(base / "events_clean.parquet")
+    nodes = read_parquet_cached(base / "section_nodes.parquet")
+    edges = read_parquet_cached(base / "section_edges.parquet")
 
     ev2, n2, e2 = apply_template(events, nodes, edges, spec)
     graph = load_graph(n2, e2)
@@ -15,14 +15,11 @@ def snapshot_positions(block_occupancy: pd.DataFrame, t: str | pd.Timestamp) ->
         return pd.DataFrame(columns=["train_id", "block_id", "u", "v", "progress_pct", "ETA_next"])  # noqa: E501
 
     t = pd.to_datetime(t, utc=True)
-    occ = block_occupancy.copy()
+    occ = block_occupancy
     dur = (occ["exit_time"] - occ["entry_time"]).dt.total_seconds() / 60
     safe = dur.where(dur > 0, other=1.0)
     prog = (t - occ["entry_time"]).dt.total_seconds() / 60 / safe
     prog = prog.clip(lower=0.0, upper=1.0)
 
-    out = occ[["train_id", "block_id", "u", "v"]].copy()
-    out["progress_pct"] = prog
-    out["ETA_next"] = occ["exit_time"]
-    return out
+    return occ[["train_id", "block_id", "u", "v"]].assign(progress_pct=prog, ETA_next=occ["exit_time"])
 
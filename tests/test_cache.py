@@ -0,0 +1,77 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from src.data.cache import read_parquet_cached, read_parquet_head, read_twin_cached, write_twin
+
+
+def test_cached_read_refreshes_on_size_change(tmp_path):
+    p = tmp_path / "a.parquet"
+    pd.DataFrame({"x": [1, 2]}).to_parquet(p, index=False)
+    assert read_parquet_cached(p)["x"].tolist() == [1, 2]
+
+    pd.DataFrame({"x": [1, 2, 3, 4, 5]}).to_parquet(p, index=False)
+
+    assert read_parquet_cached(p)["x"].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_cached_read_refreshes_on_mtime_change(tmp_path):
+    p = tmp_path / "a.parquet"
+    pd.DataFrame({"x": [1, 2]}).to_parquet(p, index=False)
+    st = p.stat()
+    assert read_parquet_cached(p)["x"].tolist() == [1, 2]
+
+    # Same-size rewrite; only the stamp's mtime tells the versions apart
+    pd.DataFrame({"x": [3, 4]}).to_parquet(p, index=False)
+    assert p.stat().st_size == st.st_size
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert read_parquet_cached(p)["x"].tolist() == [3, 4]
+
+
+def test_cached_frames_are_private(tmp_path):
+    p = tmp_path / "a.parquet"
+    pd.DataFrame({"x": [1, 2]}).to_parquet(p, index=False)
+
+    df = read_parquet_cached(p)
+    df.loc[0, "x"] = 99
+
+    assert read_parquet_cached(p)["x"].tolist() == [1, 2]
+
+
+def test_head_matches_full_read(tmp_path):
+    p = tmp_path / "a.parquet"
+    df = pd.DataFrame({"x": range(10), "s": [str(i) for i in range(10)]})
+    df.to_parquet(p, index=False)
+
+    for n in (0, 3, 50):
+        pd.testing.assert_frame_equal(read_parquet_head(p, n), pd.read_parquet(p).head(n))
+
+
+def test_twin_served_while_json_unchanged(tmp_path):
+    jp = tmp_path / "rec_plan.json"
+    recs = [{"type": "HOLD", "minutes": 2}, {"type": "SPEED", "note": "x"}]
+    jp.write_text(json.dumps(recs))
+    write_twin(recs, jp)
+
+    twin = read_twin_cached(jp, columns=["type"])
+
+    assert twin["type"].tolist() == ["HOLD", "SPEED"]
+
+
+def test_twin_stale_after_rewrite_in_same_mtime_tick(tmp_path):
+    jp = tmp_path / "rec_plan.json"
+    recs = [{"type": "HOLD"}]
+    jp.write_text(json.dumps(recs))
+    write_twin(recs, jp)
+    st = jp.stat()
+
+    # API rewrite landing on the same mtime as the producer's write
+    jp.write_text(json.dumps(recs + [{"type": "HOLD"}]))
+    os.utime(jp, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    assert read_twin_cached(jp) is None
@@ -0,0 +1,91 @@
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from src.feedback import logger
+from src.feedback.logger import (
+    FEEDBACK_FILE,
+    append_audit_entry,
+    append_feedback_row,
+    compact_feedback,
+    feedback_paths,
+    load_audit_trail,
+    load_feedback,
+)
+
+
+def _row(i):
+    return {"decision": "APPLY" if i % 2 else "DISMISS", "reason": None if i % 3 else f"r{i}", "train_id": str(i)}
+
+
+def test_compaction_preserves_every_row(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger, "_COMPACT_AFTER", 3)
+    for i in range(10):
+        append_feedback_row(tmp_path, _row(i))
+
+    df = load_feedback(tmp_path)
+
+    assert (tmp_path / FEEDBACK_FILE).exists()
+    assert df["train_id"].tolist() == [str(i) for i in range(10)]
+    assert df["decision"].tolist() == [_row(i)["decision"] for i in range(10)]
+
+
+def test_explicit_compaction_removes_parts(tmp_path):
+    for i in range(4):
+        append_feedback_row(tmp_path, _row(i))
+    before = load_feedback(tmp_path)
+
+    compact_feedback(tmp_path)
+
+    assert feedback_paths(tmp_path) == [tmp_path / FEEDBACK_FILE]
+    assert load_feedback(tmp_path).equals(before)
+
+
+def test_parts_with_differing_columns(tmp_path):
+    append_feedback_row(tmp_path, {"decision": "APPLY", "train_id": "1"})
+    append_feedback_row(tmp_path, {"decision": "ACK", "action_type": "HOLD"})
+
+    df = load_feedback(tmp_path, columns=["decision", "train_id", "action_type"])
+
+    assert df["decision"].tolist() == ["APPLY", "ACK"]
+    assert df["train_id"].isna().tolist() == [False, True]
+
+
+def test_reads_during_compaction_see_each_row_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger, "_COMPACT_AFTER", 2)
+    errors, stop = [], threading.Event()
+
+    def write(tag):
+        for i in range(40):
+            append_feedback_row(tmp_path, {"decision": "APPLY", "train_id": f"{tag}-{i}"})
+
+    def read():
+        while not stop.is_set():
+            try:
+                ids = load_feedback(tmp_path, columns=["train_id"])["train_id"].tolist()
+                if len(ids) != len(set(ids)):
+                    errors.append("duplicate rows")
+            except Exception as e:  # e.g. a part unlinked mid-read
+                errors.append(repr(e))
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    writers = [threading.Thread(target=write, args=(k,)) for k in range(3)]
+    for t in readers + writers:
+        t.start()
+    for t in writers:
+        t.join()
+    stop.set()
+    for t in readers:
+        t.join()
+
+    assert errors == []
+    assert load_feedback(tmp_path)["train_id"].nunique() == 120
+
+
+def test_audit_log_round_trip(tmp_path):
+    entries = [{"decision": "APPLY", "n": i} for i in range(3)]
+    for e in entries:
+        append_audit_entry(tmp_path, e)
+
+    assert load_audit_trail(tmp_path) == entries
@@ -0,0 +1,32 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from src.data.serdes import REFS_KEY, dumps_dedup, expand_refs, loads_dedup
+
+
+def test_dedup_round_trip_with_repeated_nested_dicts():
+    opt = {"type": "HOLD", "impact": {"delay": {"min": 2, "max": 5}}}
+    payload = {
+        "A1": [opt, {"type": "HOLD", "impact": {"delay": {"min": 2, "max": 5}}}],
+        "A2": [{"impact": {"delay": {"min": 2, "max": 5}}}, {"note": None}],
+    }
+
+    s = dumps_dedup(payload)
+
+    assert loads_dedup(s) == payload
+    assert json.loads(s)[REFS_KEY]
+
+
+def test_dedup_equal_separate_objects():
+    obj = [{"a": {"b": 1}}, {"a": {"b": 1}}]
+
+    assert loads_dedup(dumps_dedup(obj)) == obj
+
+
+def test_plain_json_passes_through():
+    plain = [{"a": 1}, {"a": 1}]
+
+    assert loads_dedup(json.dumps(plain)) == plain
+    assert expand_refs(plain) == plain
@@ -8,6 +8,11 @@ export type StateResponse = {
 }
 const API_BASE = (import.meta.env.VITE_API_BASE as string) || 'http://127.0.0.1:8000'
 
+// Admin user list changes rarely; reuse it for a short while across page visits.
+// Any admin mutation through this client clears it.
+const USERS_TTL_MS = 30_000
+const usersCache = new Map<string, { at: number; data: { users: any[] } }>()
+
 export type ClientConfig = {
   apiBase?: string
   token?: string
@@ -51,19 +56,21 @@ export class ApiClient {
     return res.json() as any
   }
 
-  async getState(scope: string, date: string, opts?: { train_id?: string; station_id?: string }): Promise<StateResponse> {
+  async getState(scope: string, date: string, opts?: { train_id?: string; station_id?: string; start_ts?: string; end_ts?: string }): Promise<StateResponse> {
     const u = new URL(this.base + '/state')
     u.searchParams.set('scope', scope)
     u.searchParams.set('date', date)
     if (opts?.train_id) u.searchParams.set('train_id', String(opts.train_id))
     if (opts?.station_id) u.searchParams.set('station_id', String(opts.station_id))
+    if (opts?.start_ts) u.searchParams.set('start_ts', opts.start_ts)
+    if (opts?.end_ts) u.searchParams.set('end_ts', opts.end_ts)
     const res = await fetch(u.toString(), { headers: this.headers() })
     if (!res.ok) throw new Error(`state failed: ${res.status}`)
     return res.json()
   }
 
 
-  async getRadar(scope: string, date: string, opts?: { station_id?: string; train_id?: string }): Promise<{ radar: any[]; risk_kpis: Record<string, any> }> {
+  async getRadar(scope: string, date: string, opts?: { station_id?: string; train_id?: string }): Promise<{ radar: any[]; risk_kpis: Record<string, any>; radar_agg?: { lead_range: string; type: string; severity: string; count: number }[] }> {
     const u = new URL(this.base + '/radar')
     u.searchParams.set('scope', scope)
     u.searchParams.set('date', date)
@@ -74,11 +81,13 @@ export class ApiClient {
     return res.json()
   }
 
-  async getRecommendations(scope: string, date: string, station_id?: string): Promise<{ rec_plan: any[]; alt_options: any[]; plan_metrics: Record<string, any>; plan_apply_report?: Record<string, any> | null; plan_version?: string; audit_log?: Record<string, any> }> {
+  async getRecommendations(scope: string, date: string, station_id?: string, page?: { limit?: number; offset?: number }): Promise<{ rec_plan: any[]; rec_total?: number; alt_options: any[]; plan_metrics: Record<string, any>; plan_apply_report?: Record<string, any> | null; plan_version?: string; audit_log?: Record<string, any> }> {
     const u = new URL(this.base + '/recommendations')
     u.searchParams.set('scope', scope)
     u.searchParams.set('date', date)
     if (station_id) u.searchParams.set('station_id', station_id)
+    if (page?.limit != null) u.searchParams.set('limit', String(page.limit))
+    if (page?.offset) u.searchParams.set('offset', String(page.offset))
     const res = await fetch(u.toString(), { headers: this.headers() })
     if (!res.ok) throw new Error(`reco failed: ${res.status}`)
     return res.json()
@@ -174,16 +183,22 @@ export class ApiClient {
   }
 
   // Admin
-  async adminListUsers(): Promise<{ users: any[] }> {
+  async adminListUsers(opts?: { force?: boolean }): Promise<{ users: any[] }> {
+    const key = `${this.base}|${this.token || this.user || ''}`
+    const hit = usersCache.get(key)
+    if (!opts?.force && hit && Date.now() - hit.at < USERS_TTL_MS) return hit.data
     const res = await fetch(this.base + '/admin/users', { headers: this.headers() })
     if (!res.ok) throw new Error(await res.text())
-    return res.json()
+    const data = await res.json()
+    usersCache.set(key, { at: Date.now(), data })
+    return data
   }
   async adminCreateUser(username: string, password: string, role: string, station_id?: string | null, train_id?: string | null): Promise<any> {
     const res = await fetch(this.base + '/admin/users', {
       method: 'POST', headers: this.headers(), body: JSON.stringify({ username, password, role, station_id, train_id })
     })
     if (!res.ok) throw new Error(await res.text())
+    usersCache.clear()
     return res.json()
   }
   async adminChangeRole(username: string, role: string): Promise<any> {
@@ -191,6 +206,7 @@ export class ApiClient {
       method: 'PUT', headers: this.headers(), body: JSON.stringify({ role })
     })
     if (!res.ok) throw new Error(await res.text())
+    usersCache.clear()
     return res.json()
   }
 
@@ -199,6 +215,7 @@ export class ApiClient {
       method: 'PUT', headers: this.headers(), body: JSON.stringify({ station_id })
     })
     if (!res.ok) throw new Error(await res.text())
+    usersCache.clear()
     return res.json()
   }
 
@@ -207,6 +224,7 @@ export class ApiClient {
       method: 'PUT', headers: this.headers(), body: JSON.stringify({ train_id })
     })
     if (!res.ok) throw new Error(await res.text())
+    usersCache.clear()
     return res.json()
   }
 
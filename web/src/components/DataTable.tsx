@@ -1,4 +1,4 @@
-export function DataTable({ columns, rows }: { columns: { key: string; label: string }[]; rows: any[] }) {
+export function DataTable({ columns, rows, onRowClick, isSelected }: { columns: { key: string; label: string }[]; rows: any[]; onRowClick?: (row: any, index: number) => void; isSelected?: (row: any) => boolean }) {
   return (
     <table className="table">
       <thead>
@@ -8,7 +8,7 @@ export function DataTable({ columns, rows }: { columns: { key: string; label: st
       </thead>
       <tbody>
         {rows.map((r, i) => (
-          <tr key={i}>
+          <tr key={i} onClick={onRowClick ? () => onRowClick(r, i) : undefined} style={isSelected?.(r) ? { background: 'rgba(143,180,255,0.15)' } : (onRowClick ? { cursor: 'pointer' } : undefined)}>
             {columns.map(c => <td key={c.key}>{r[c.key]}</td>)}
           </tr>
         ))}
@@ -16,4 +16,3 @@ export function DataTable({ columns, rows }: { columns: { key: string; label: st
     </table>
   )
 }
-
@@ -3,21 +3,37 @@ import { Plot } from '../../lib/plotly'
 export type TimelineItem = { y: string, start: string | Date, end: string | Date, color?: string, label?: string }
 
 export function Timeline({ items, title }: { items: TimelineItem[], title?: string }) {
-  // Build a scatter trace per item as a horizontal line from start to end
-  const traces = items.map((it, i) => ({
-    type: 'scatter',
-    mode: 'lines',
-    x: [it.start, it.end],
-    y: [it.y, it.y],
-    line: { width: 10, color: it.color || '#5bc0be', shape: 'hv' },
+  // One horizontal bar trace for all items: base = start (epoch ms), x = duration (ms)
+  const ys: string[] = []
+  const base: number[] = []
+  const dur: number[] = []
+  const colors: string[] = []
+  const text: string[] = []
+  for (const it of items) {
+    const s = new Date(it.start).getTime()
+    const e = new Date(it.end).getTime()
+    if (!Number.isFinite(s) || !Number.isFinite(e)) continue
+    ys.push(it.y)
+    base.push(s)
+    dur.push(Math.max(0, e - s))
+    colors.push(it.color || '#5bc0be')
+    text.push(it.label || `${it.y}`)
+  }
+  const traces = [{
+    type: 'bar',
+    orientation: 'h',
+    y: ys,
+    x: dur,
+    base,
+    marker: { color: colors },
     hoverinfo: 'text',
-    text: it.label || `${it.y}`,
+    hovertext: text,
     showlegend: false,
-  }))
+  }]
 
   return (
     <Plot
-      data={traces}
+      data={traces as any}
       layout={{
         paper_bgcolor: 'rgba(0,0,0,0)',
         plot_bgcolor: 'rgba(0,0,0,0)',
@@ -24,11 +24,11 @@ export default function AdminPage() {
   const [state, setState] = useState<any | null>(null)
   const [edges, setEdges] = useState<any[]>([])
 
-  async function refresh() {
+  async function refresh(force = false) {
     setLoading(true)
     setErr(null)
     try {
-      const res = await api.adminListUsers()
+      const res = await api.adminListUsers({ force })
       setUsers(res.users || [])
     } catch (e: any) {
       setErr(e?.message || 'Failed to load users')
@@ -116,7 +116,7 @@ export default function AdminPage() {
         <div className="hstack" style={{ alignItems: 'center' }}>
           <strong>Users</strong>
           <span className="spacer" />
-          <button onClick={refresh} disabled={loading}>{loading ? 'Refreshing…' : 'Refresh'}</button>
+          <button onClick={() => refresh(true)} disabled={loading}>{loading ? 'Refreshing…' : 'Refresh'}</button>
         </div>
         <table className="table">
           <thead><tr><th>User</th><th>Role</th><th>Station</th><th>Train</th><th>Change</th></tr></thead>
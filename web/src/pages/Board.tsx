@@ -27,7 +27,7 @@ export default function BoardPage() {
   const waiting = useMemo(() => (state?.waiting_ledger || []).slice(0, 100), [state])
   const timelineItems: TimelineItem[] = useMemo(() => {
     const rows = (state?.platform_occupancy || []).slice(0, 80)
-    return rows.map((r: any) => ({ y: String(r.station_id ?? ''), start: r.arr_platform, end: r.dep_platform, label: `${r.train_id}` }))
+    return rows.map((r: any) => ({ y: String(r.station_label ?? r.station_id ?? ''), start: r.arr_platform, end: r.dep_platform, label: `${r.train_id}` }))
   }, [state])
   const occupancyHeat = useMemo(() => {
     const rows = state?.platform_occupancy || []
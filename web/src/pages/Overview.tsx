@@ -34,7 +34,7 @@ export default function OverviewPage() {
   const timelineItems: TimelineItem[] = useMemo(() => {
     const rows = (state?.platform_occupancy || []).slice(0, 40)
     return rows.map((r: any) => ({
-      y: String(r.station_id ?? ''),
+      y: String(r.station_label ?? r.station_id ?? ''),
       start: r.arr_platform,
       end: r.dep_platform,
       label: `${r.train_id}`,
@@ -12,10 +12,11 @@ export default function RadarPage() {
   const { scope, date, stationId, trainId } = usePrefs()
   const [rows, setRows] = useState<any[]>([])
   const [kpis, setKpis] = useState<Record<string, any>>({})
+  const [agg, setAgg] = useState<{ lead_range: string; severity: string; count: number }[] | null>(null)
   const [err, setErr] = useState<string | null>(null)
   useEffect(() => {
     let live = true
-    api.getRadar(scope, date, { station_id: stationId || undefined, train_id: trainId || undefined }).then(d => { if (!live) return; setRows(d.radar || []); setKpis(d.risk_kpis || {}) }).catch(e => setErr(String(e)))
+    api.getRadar(scope, date, { station_id: stationId || undefined, train_id: trainId || undefined }).then(d => { if (!live) return; setRows(d.radar || []); setKpis(d.risk_kpis || {}); setAgg(d.radar_agg || null) }).catch(e => setErr(String(e)))
     return () => { live = false }
   }, [api, scope, date, stationId, trainId])
 
@@ -35,13 +36,22 @@ export default function RadarPage() {
       for (let i = 0; i < buckets.length - 1; i++) if (v >= buckets[i] && v < buckets[i + 1]) return i
       return bucketLabels.length - 1
     }
+    if (agg) {
+      // Counts pre-aggregated by the producer (unfiltered view)
+      agg.forEach(a => {
+        const sidx = Math.max(0, sevCats.indexOf(a.severity || 'Unknown'))
+        const bidx = bucketLabels.indexOf(a.lead_range)
+        z[sidx][bidx < 0 ? bucketLabels.length - 1 : bidx] += Number(a.count) || 0
+      })
+      return { z, x: bucketLabels, y: sevCats }
+    }
     rows.forEach(r => {
       const sidx = Math.max(0, sevCats.indexOf(r.severity || 'Unknown'))
       const bidx = idxForLead(Number(r.lead_min))
       z[sidx][bidx] += 1
     })
     return { z, x: bucketLabels, y: sevCats }
-  }, [rows])
+  }, [rows, agg])
   const timeline = useMemo(() => {
     const buckets: Record<string, number> = {}
     rows.forEach(r => {
@@ -16,6 +16,12 @@ export default function RecommendationsPage() {
   const [optimizing, setOptimizing] = useState(false)
   const [applying, setApplying] = useState<string | null>(null)
   const [selected, setSelected] = useState<string | null>(null)
+  const byId = useMemo(() => {
+    const m = new Map<string, any>()
+    for (const r of rows) if (r.action_id) m.set(String(r.action_id), r)
+    return m
+  }, [rows])
+  const selectedRec = selected ? byId.get(selected) : undefined
   const reductionChart = useMemo(() => {
     if (!applyReport) return null
     const toNumber = (v: any) => {
@@ -81,6 +87,12 @@ export default function RecommendationsPage() {
     }
   }
 
+  async function onFeedback(action_id: string, decision: 'APPLY' | 'DISMISS') {
+    const rec = byId.get(action_id)
+    if (!rec) return
+    await api.postFeedback(scope, date, rec, decision)
+  }
+
   async function onApply(action_id: string) {
     setApplying(action_id)
     setErr(null)
@@ -105,15 +117,7 @@ export default function RecommendationsPage() {
       {err && <div className="card" style={{ borderColor: '#ff6b6b', marginTop: 8 }}>Error: {err}</div>}
       <div className="card" style={{ marginTop: 12 }}>
         <div className="muted">Tip: Click a row to select. Press 'a' to Apply, 'd' to Dismiss, 'r' to Revert plan.</div>
-        <Keybinds selected={selected} rows={rows} onApply={async (id) => {
-          const rec = rows.find(r => (r.action_id || '') === id)
-          if (!rec) return
-          await api.postFeedback(scope, date, rec, 'APPLY')
-        }} onDismiss={async (id) => {
-          const rec = rows.find(r => (r.action_id || '') === id)
-          if (!rec) return
-          await api.postFeedback(scope, date, rec, 'DISMISS')
-        }} onRevert={async () => { await api.revertPlan(scope, date) }} />
+        <Keybinds selected={selected} rows={rows} onApply={id => onFeedback(id, 'APPLY')} onDismiss={id => onFeedback(id, 'DISMISS')} onRevert={async () => { await api.revertPlan(scope, date) }} />
         <DataTable columns={[
           { key: 'train_id', label: 'Train' },
           { key: 'type', label: 'Type' },
@@ -122,8 +126,14 @@ export default function RecommendationsPage() {
           { key: 'block_id', label: 'Block' },
           { key: 'minutes', label: 'Minutes' },
           { key: 'reason', label: 'Reason' }
-        ]} rows={rows.slice(0, 50)} />
-        <div className="muted" style={{ marginTop: 4 }}>Selected: {selected || 'None'}</div>
+        ]} rows={rows.slice(0, 50)} onRowClick={r => setSelected(r.action_id || null)} isSelected={r => !!selected && r.action_id === selected} />
+        <div className="hstack" style={{ marginTop: 4, alignItems: 'center' }}>
+          <span className="muted">Selected: {selectedRec ? `${selectedRec.type} · Train ${selectedRec.train_id} · ${selectedRec.minutes ?? ''} min` : 'None'}</span>
+          <span className="spacer" />
+          {/* One set of action buttons, operating on the selected row */}
+          <button onClick={() => selected && onApply(selected)} disabled={!selectedRec || applying === selected} style={{ marginRight: 8 }}>{applying && applying === selected ? 'Applying…' : 'Apply'}</button>
+          <button onClick={() => selected && onFeedback(selected, 'DISMISS')} disabled={!selectedRec}>Dismiss</button>
+        </div>
       </div>
       {reductionChart && (
         <div className="card" style={{ marginTop: 12 }}>
@@ -146,13 +156,12 @@ export default function RecommendationsPage() {
         </div>
       </div>
       <div className="card" style={{ marginTop: 12 }}>
-        <div className="hstack"><strong>Quick Apply</strong><span className="spacer" /><span className="muted">first 20</span></div>
+        <div className="hstack"><strong>Top Recommendations</strong><span className="spacer" /><span className="muted">first 20 · click to select, then Apply or Dismiss above</span></div>
         <div className="row">
           {rows.slice(0, 20).map((r: any, i: number) => (
             <div key={i} className="card" style={{ minWidth: 260, borderColor: (selected === (r.action_id || '') ? '#8fb4ff' : undefined) }} onClick={() => setSelected(r.action_id || '')}>
               <div className="muted">{r.type} · Train {r.train_id}</div>
               <div style={{ fontSize: 14 }}>At {r.at_station || r.station_id} · {r.minutes} min</div>
-              <button onClick={() => onApply(r.action_id || '')} disabled={!r.action_id || applying === (r.action_id || '')} style={{ marginTop: 8 }}>{applying === (r.action_id || '') ? 'Applying…' : 'Apply'}</button>
             </div>
           ))}
         </div>
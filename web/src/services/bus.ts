@@ -42,30 +42,45 @@ function projectSchematic(topologyId: string, edges: any[], blocksIn: any[]): To
   return { sectionId: topologyId, tracks: [track], platforms, signals }
 }
 
+// Recs shown in the 3D ops panel
+const BUS_RECS = 5
+
+function toRecs(plan: any[] | undefined): Rec[] {
+  return (plan || []).slice(0, BUS_RECS).map((r: any, i: number) => ({ id: r.action_id || `R${i}`, label: r.why || r.reason || 'Rec', delta: { sumDelay: 0 }, actions: [{ op: 'hold', trainId: String(r.train_id), minutes: Number(r.minutes || 2) } as any], why: (r.binding_constraints || []).map((c: string) => String(c)) }))
+}
+
 export async function startBus(scope: string, date: string, api: ApiClient) {
   const setTopology = useStore.getState().setTopology
   const setTimeline = useStore.getState().setTimeline
   const setRecs = useStore.getState().setRecs
   // Initial load
-  const [edges, nodes, blocks, rec] = await Promise.all([
+  const [edges, nodes, blocks, reco] = await Promise.all([
     api.getEdges(scope, date).then(d => d.edges || []),
     api.getNodes(scope, date).then(d => d.nodes || []),
     api.getBlockOccupancy(scope, date).then(d => d.blocks || []),
-    api.getRecommendations(scope, date).then(d => d.rec_plan || []),
+    api.getRecommendations(scope, date, undefined, { limit: BUS_RECS }),
   ])
   const topo = projectSchematic('SEC-1', edges, blocks)
   setTopology(topo)
   const { buildKeyframesFromBlocks } = await import('../utils/keyframe')
   const tl = buildKeyframesFromBlocks(topo, blocks)
   setTimeline(tl)
-  const recs: Rec[] = (rec || []).slice(0, 5).map((r: any, i: number) => ({ id: r.action_id || `R${i}`, label: r.why || r.reason || 'Rec', delta: { sumDelay: 0 }, actions: [{ op: 'hold', trainId: String(r.train_id), minutes: Number(r.minutes || 2) } as any], why: (r.binding_constraints || []).map((c: string) => String(c)) }))
-  setRecs(recs)
-  // Poll updates
-  setInterval(async () => {
+  setRecs(toRecs(reco.rec_plan))
+  let version = reco.plan_version
+  // Poll updates: schedule the next poll only after the previous one settles so slow
+  // responses never stack up, and skip the request while the tab is hidden. Only the
+  // shown recs are requested, and the store is left alone while the plan is unchanged
+  const poll = async () => {
     try {
-      const rec2 = await api.getRecommendations(scope, date)
-      const rr: Rec[] = (rec2.rec_plan || []).slice(0, 5).map((r: any, i: number) => ({ id: r.action_id || `R${i}`, label: r.why || r.reason || 'Rec', delta: { sumDelay: 0 }, actions: [{ op: 'hold', trainId: String(r.train_id), minutes: Number(r.minutes || 2) } as any], why: (r.binding_constraints || []).map((c: string) => String(c)) }))
-      setRecs(rr)
+      if (typeof document === 'undefined' || document.visibilityState !== 'hidden') {
+        const rec2 = await api.getRecommendations(scope, date, undefined, { limit: BUS_RECS })
+        if (rec2.plan_version == null || rec2.plan_version !== version) {
+          version = rec2.plan_version
+          setRecs(toRecs(rec2.rec_plan))
+        }
+      }
     } catch {}
-  }, 5000)
+    setTimeout(poll, 5000)
+  }
+  setTimeout(poll, 5000)
 }